@@ -7,6 +7,7 @@ from .vims_team import VIMS_TEAM
 from .vims_isis3 import VIMS_ISIS3
 from .vims_qub import VIMS_QUB
 from .vims_lbl import VIMS_LBL
+from .batch import load_many
 
 from .vims_nav import VIMS_NAV
 from .vims_nav_isis3 import VIMS_NAV_ISIS3
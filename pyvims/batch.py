@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""VIMS batch loader module."""
+
+from collections import deque, namedtuple
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from functools import partial
+
+from .vims import VIMS
+
+
+Result = namedtuple('Result', 'img_id data error')
+
+
+def _load(loader, img_id, root, fields):
+    """Load a single cube and catch its error."""
+    try:
+        cube = loader(img_id, root)
+
+        if fields is None:
+            return Result(img_id, cube, None)
+
+        return Result(img_id, {field: getattr(cube, field) for field in fields}, None)
+
+    except Exception as err:
+        return Result(img_id, None, err)
+
+
+def load_many(img_ids, root='', workers=4, fields=None, processes=0,
+              ordered=True, window=None, loader=VIMS):
+    """Load many VIMS cubes in parallel.
+
+    Parameters
+    ----------
+    img_ids: iterable
+        VIMS images IDs.
+    root: str, optional
+        Data root folder (prefix).
+    workers: int, optional
+        Number of I/O threads.
+    fields: list, optional
+        Cube attributes to load (eg. ``['cube', 'lon', 'lat']``).
+        If ``None``, the cube objects are returned (only the labels
+        are loaded, the data are loaded on first access).
+    processes: int, optional
+        Number of worker processes used instead of the threads
+        to load and decode the cubes (``fields`` required).
+    ordered: bool, optional
+        Yield the results in the input order or
+        as soon as the cubes are loaded.
+    window: int, optional
+        Maximum number of cubes in flight
+        (twice the number of workers by default).
+    loader: callable, optional
+        Cube loader (``VIMS`` by default).
+
+    Returns
+    -------
+    generator
+        ``Result(img_id, data, error)`` for each cube.
+        The errors are collected in the results
+        and do not stop the other loads.
+
+    Raises
+    ------
+    ValueError
+        If the ``fields`` are missing with worker processes.
+
+    """
+    if processes and fields is None:
+        raise ValueError('The cubes `fields` are required with worker processes.')
+
+    if processes:
+        executor = partial(ProcessPoolExecutor, max_workers=processes)
+    else:
+        executor = partial(ThreadPoolExecutor, max_workers=workers)
+
+    if window is None:
+        window = 2 * (processes or workers)
+
+    return _results(executor, iter(img_ids), root, fields, ordered, window, loader)
+
+
+def _results(executor, img_ids, root, fields, ordered, window, loader):
+    """Submit the cubes in a bounded window and yield the results.
+
+    The executor is only created when the first result is requested
+    and shut down when the generator is exhausted or closed.
+
+    """
+    pending = deque()
+
+    with executor() as pool:
+
+        def submit():
+            while len(pending) < window:
+                img_id = next(img_ids, None)
+                if img_id is None:
+                    break
+                pending.append(pool.submit(_load, loader, img_id, root, fields))
+
+        try:
+            submit()
+            while pending:
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                        yield future.result()
+                submit()
+        finally:
+            for future in pending:
+                future.cancel()
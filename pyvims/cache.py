@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""Persistent labels cache module.
+
+The cache is disabled by default. It can be enabled with
+:py:func:`enable_cache` or with the ``VIMS_CACHE`` environment
+variable (cache database filename).
+
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime, time
+
+import pvl
+from pvl.collections import PVLGroup, PVLModule, PVLObject, Quantity, Units
+
+from .isis.header import ISISBlock, Units as ISISUnits
+
+
+CACHE_NAME = '.pyvims_cache.sqlite'
+
+# Labels collections and quantities allowed in the cache
+BLOCKS = {f'{cls.__module__}.{cls.__qualname__}': cls
+          for cls in (PVLModule, PVLObject, PVLGroup, ISISBlock)}
+
+QUANTITIES = {f'{cls.__module__}.{cls.__qualname__}': cls
+              for cls in (Quantity, Units, ISISUnits)}
+
+TIMES = {cls.__name__: cls for cls in (datetime, date, time)}
+
+
+@contextmanager
+def database(fname, journal=None):
+    """SQLite database transaction.
+
+    The transaction is committed (or rolled back on error)
+    and the connection is always closed on exit.
+
+    Parameters
+    ----------
+    fname: str
+        Database filename.
+    journal: str, optional
+        Rollback journal mode (eg. ``MEMORY``).
+
+    """
+    db = sqlite3.connect(fname, timeout=30)
+    try:
+        if journal is not None:
+            db.execute(f'PRAGMA journal_mode = {journal}')
+        with db:
+            yield db
+    finally:
+        db.close()
+
+
+def _name(value):
+    """Qualified class name."""
+    return f'{type(value).__module__}.{type(value).__qualname__}'
+
+
+def _encode(value):
+    """Convert a parsed label into JSON values.
+
+    Raises
+    ------
+    TypeError
+        If the label contains an unsupported value type.
+
+    """
+    if _name(value) in BLOCKS:
+        items = value if isinstance(value, ISISBlock) else value.items()
+        return {'block': _name(value),
+                'items': [[key, _encode(val)] for key, val in items]}
+
+    if _name(value) in QUANTITIES:
+        return {'quantity': _name(value),
+                'value': _encode(value.value), 'units': value.units}
+
+    if type(value) in (datetime, date, time):
+        return {'time': type(value).__name__, 'value': value.isoformat()}
+
+    if type(value) in (list, tuple):
+        return [_encode(val) for val in value]
+
+    if type(value) in (set, frozenset):
+        return {'set': [_encode(val) for val in value]}
+
+    if value is None or type(value) in (str, int, float, bool):
+        return value
+
+    raise TypeError(f'Value type `{_name(value)}` can not be cached.')
+
+
+def _decode(obj):
+    """Rebuild the label collections, quantities and times."""
+    if 'block' in obj:
+        return BLOCKS[obj['block']]([tuple(item) for item in obj['items']])
+
+    if 'quantity' in obj:
+        return QUANTITIES[obj['quantity']](obj['value'], obj['units'])
+
+    if 'time' in obj:
+        return TIMES[obj['time']].fromisoformat(obj['value'])
+
+    if 'set' in obj:
+        return set(obj['set'])
+
+    raise ValueError(f'Invalid cached object: {obj}')
+
+
+def dumps(label):
+    """Serialize a parsed label in JSON."""
+    return json.dumps(_encode(label))
+
+
+def loads(text):
+    """Load a JSON serialized label.
+
+    Only the known label collections are rebuilt
+    (no code is executed from the cache content).
+
+    """
+    return json.loads(text, object_hook=_decode)
+
+
+class LabelCache:
+    """Persistent labels cache.
+
+    The parsed labels are serialized in JSON, stored in
+    a SQLite database and keyed by the absolute path,
+    the size and the modification time of the files.
+
+    Parameters
+    ----------
+    fname: str
+        Cache database filename.
+
+    """
+
+    def __init__(self, fname):
+        self.fname = fname
+
+        with self.db as db:
+            db.execute('CREATE TABLE IF NOT EXISTS labels ('
+                       'path TEXT, loader TEXT, size INTEGER, mtime INTEGER, '
+                       'label TEXT, PRIMARY KEY (path, loader))')
+
+    def __str__(self):
+        return self.fname
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self} ({len(self)} labels)'
+
+    def __len__(self):
+        with self.db as db:
+            return db.execute('SELECT COUNT(*) FROM labels').fetchone()[0]
+
+    @property
+    def db(self):
+        """Cache database transaction."""
+        return database(self.fname)
+
+    def get(self, filename, loader=pvl.load):
+        """Get the label from the cache or load it.
+
+        Parameters
+        ----------
+        filename: str
+            Label filename.
+        loader: callable, optional
+            Label loader (``pvl.load`` by default).
+
+        Returns
+        -------
+        object
+            Parsed label.
+
+        """
+        path = os.path.abspath(filename)
+        name = f'{loader.__module__}.{loader.__qualname__}'
+        stat = os.stat(path)
+
+        with self.db as db:
+            row = db.execute(
+                'SELECT label FROM labels '
+                'WHERE path = ? AND loader = ? AND size = ? AND mtime = ?',
+                (path, name, stat.st_size, stat.st_mtime_ns)).fetchone()
+
+        if row is not None:
+            try:
+                return loads(row[0])
+            except (ValueError, TypeError, KeyError):
+                pass  # Invalid cached label: reloaded and replaced
+
+        label = loader(filename)
+
+        try:
+            with self.db as db:
+                db.execute(
+                    'INSERT OR REPLACE INTO labels VALUES (?, ?, ?, ?, ?)',
+                    (path, name, stat.st_size, stat.st_mtime_ns, dumps(label)))
+        except (sqlite3.OperationalError, TypeError):
+            pass  # Locked database or unsupported label: the label is not cached
+
+        return label
+
+    def clear(self):
+        """Remove all the cached labels."""
+        with self.db as db:
+            db.execute('DELETE FROM labels')
+
+
+CACHE = LabelCache(os.environ['VIMS_CACHE']) if 'VIMS_CACHE' in os.environ else None
+
+
+def enable_cache(root=None, fname=CACHE_NAME):
+    """Enable the persistent labels cache.
+
+    Parameters
+    ----------
+    root: str, optional
+        Cache folder location.
+        Use ``$VIMS_DATA`` environment variable
+        first or the local directory otherwise.
+    fname: str, optional
+        Cache database filename.
+
+    Returns
+    -------
+    LabelCache
+        Enabled labels cache.
+
+    """
+    global CACHE
+
+    if root is None:
+        root = os.environ.get('VIMS_DATA', os.getcwd())
+
+    CACHE = LabelCache(os.path.join(root, fname))
+    return CACHE
+
+
+def disable_cache():
+    """Disable the persistent labels cache."""
+    global CACHE
+    CACHE = None
+
+
+def load_cached(filename, loader=pvl.load):
+    """Load a label with the persistent cache (if enabled).
+
+    Parameters
+    ----------
+    filename: str
+        Label filename.
+    loader: callable, optional
+        Label loader (``pvl.load`` by default).
+
+    Returns
+    -------
+    object
+        Parsed label.
+
+    """
+    if CACHE is None:
+        return loader(filename)
+    return CACHE.get(filename, loader)
@@ -0,0 +1,4 @@
+"""VIMS catalog module."""
+
+from .files import FileIndex, PRODUCTS, match_product
+from .meta import MetaCatalog
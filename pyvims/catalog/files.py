@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""VIMS products files index module.
+
+The data root tree is scanned once and the VIMS products
+found are stored in a SQLite database. The next scans only
+list the folders modified since the previous scan (folder
+``mtime`` changes when an entry is added, removed or renamed).
+
+"""
+
+import os
+import re
+
+from ..cache import database
+
+
+INDEX_NAME = '.pyvims_index.sqlite'
+
+IMG_ID = r'(?P<img_id>\d+_\d+)'
+
+# VIMS products filenames patterns
+PRODUCTS = {
+    'QUB': rf'v{IMG_ID}\.qub',
+    'LBL': rf'v{IMG_ID}\.lbl',
+    'CUB_VIS': rf'v{IMG_ID}_vis\.cub',
+    'CUB_IR': rf'v{IMG_ID}_ir\.cub',
+    'CAL_VIS': rf'C{IMG_ID}_vis_cal\.cub',
+    'CAL_IR': rf'C{IMG_ID}_ir_cal\.cub',
+    'NAV_VIS': rf'N{IMG_ID}_vis\.cub',
+    'NAV_IR': rf'N{IMG_ID}_ir\.cub',
+    'DNS_VIS': rf'C{IMG_ID}_vis_dns\.cub',
+    'DNS_IR': rf'C{IMG_ID}_ir_dns\.cub',
+    'CLN_VIS': rf'C{IMG_ID}_vis\.cub',
+    'CLN_IR': rf'C{IMG_ID}_ir\.cub',
+    'TEAM': rf'CM_{IMG_ID}\.cub',
+    'NAV': rf'V{IMG_ID}\.nav',
+    'GEOTIFF': rf'{IMG_ID}\.tif',
+}
+
+PATTERNS = [(product, re.compile(pattern)) for product, pattern in PRODUCTS.items()]
+
+
+def connect(fname):
+    """Catalog database transaction (closed on exit).
+
+    The rollback journal is kept in memory to avoid
+    changing the data folders ``mtime`` on each update
+    (the catalogs can always be rebuilt).
+
+    """
+    return database(fname, journal='MEMORY')
+
+
+def match_product(fname):
+    """Match a filename with a VIMS product.
+
+    Parameters
+    ----------
+    fname: str
+        File basename.
+
+    Returns
+    -------
+    (str, str) or None
+        Image ID and product type (if any).
+
+    """
+    for product, pattern in PATTERNS:
+        match = pattern.fullmatch(fname)
+        if match:
+            return match['img_id'], product
+    return None
+
+
+class FileIndex:
+    """VIMS products files index.
+
+    Parameters
+    ----------
+    root: str, optional
+        Data root folder.
+        Use ``$VIMS_DATA`` environment variable
+        first or the local directory otherwise.
+    fname: str, optional
+        Index database filename (relative to the root or absolute).
+    scan: bool, optional
+        Update the index on load.
+
+    Note
+    ----
+    The files sizes are updated only when their
+    folder is rescanned.
+
+    """
+
+    def __init__(self, root=None, fname=INDEX_NAME, scan=True):
+        if root is None:
+            root = os.environ.get('VIMS_DATA', os.getcwd())
+
+        self.root = os.path.abspath(root)
+        self.fname = os.path.join(self.root, fname)
+
+        with self.db as db:
+            db.execute('CREATE TABLE IF NOT EXISTS dirs ('
+                       'path TEXT PRIMARY KEY, parent TEXT, mtime INTEGER)')
+            db.execute('CREATE TABLE IF NOT EXISTS files ('
+                       'path TEXT PRIMARY KEY, dir TEXT, img_id TEXT, '
+                       'product TEXT, size INTEGER)')
+            db.execute('CREATE INDEX IF NOT EXISTS files_img_id ON files (img_id)')
+
+        if scan:
+            self.scan()
+
+    def __str__(self):
+        return self.root
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self} ({len(self)} images)'
+
+    def __len__(self):
+        with self.db as db:
+            return db.execute('SELECT COUNT(DISTINCT img_id) FROM files').fetchone()[0]
+
+    def __contains__(self, img_id):
+        with self.db as db:
+            return db.execute('SELECT 1 FROM files WHERE img_id = ? LIMIT 1',
+                              (img_id,)).fetchone() is not None
+
+    def __getitem__(self, img_id):
+        products = self.products(img_id)
+        if not products:
+            raise KeyError(f'Image `{img_id}` not found in `{self}`.')
+        return {product: fname for product, (fname, _) in products.items()}
+
+    @property
+    def db(self):
+        """Index database transaction."""
+        return connect(self.fname)
+
+    def _remove(self, db, path):
+        """Remove a folder and its sub-folders from the index."""
+        prefix = os.path.join(path, '') if path else ''
+        db.execute('DELETE FROM dirs WHERE path = ? OR substr(path, 1, ?) = ?',
+                   (path, len(prefix), prefix))
+        db.execute('DELETE FROM files WHERE dir = ? OR substr(dir, 1, ?) = ?',
+                   (path, len(prefix), prefix))
+
+    def _scan_dir(self, db, path, known):
+        """Scan a folder if it was modified since the last scan.
+
+        Returns
+        -------
+        bool, list
+            Folder rescanned flag and sub-folders relative paths.
+
+        """
+        folder = os.path.join(self.root, path)
+        mtime = os.stat(folder).st_mtime_ns
+
+        if known.get(path) == mtime:
+            subdirs = [sub for sub, in db.execute(
+                'SELECT path FROM dirs WHERE parent = ?', (path,))]
+            return False, subdirs
+
+        subdirs, files = [], []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                rel = os.path.join(path, entry.name) if path else entry.name
+
+                if entry.is_dir():
+                    subdirs.append(rel)
+                    continue
+
+                match = match_product(entry.name)
+                if match is not None:
+                    files.append((rel, path, *match, entry.stat().st_size))
+
+        # Remove the deleted sub-folders
+        for sub, in db.execute('SELECT path FROM dirs WHERE parent = ?', (path,)).fetchall():
+            if sub not in subdirs:
+                self._remove(db, sub)
+
+        db.execute('DELETE FROM files WHERE dir = ?', (path,))
+        db.executemany('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)', files)
+        db.execute('INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)',
+                   (path, os.path.dirname(path) if path else None, mtime))
+
+        return True, subdirs
+
+    def scan(self):
+        """Update the index with the modified folders.
+
+        Returns
+        -------
+        int
+            Number of folders rescanned.
+
+        """
+        count = 0
+        with self.db as db:
+            known = dict(db.execute('SELECT path, mtime FROM dirs'))
+
+            queue = ['']
+            while queue:
+                path = queue.pop()
+                try:
+                    updated, subdirs = self._scan_dir(db, path, known)
+                except FileNotFoundError:
+                    self._remove(db, path)
+                    continue
+
+                count += updated
+                queue.extend(subdirs)
+
+        return count
+
+    def products(self, img_id):
+        """Products available for an image ID.
+
+        Parameters
+        ----------
+        img_id: str
+            VIMS image ID.
+
+        Returns
+        -------
+        dict
+            Products absolute filenames and sizes.
+
+        """
+        with self.db as db:
+            rows = db.execute('SELECT product, path, size FROM files '
+                              'WHERE img_id = ? ORDER BY path', (img_id,)).fetchall()
+
+        products = {}
+        for product, path, size in rows:
+            products.setdefault(product, (os.path.join(self.root, path), size))
+        return products
+
+    def find(self, img_id, product):
+        """Find a product filename.
+
+        Parameters
+        ----------
+        img_id: str
+            VIMS image ID.
+        product: str
+            Product type (see ``PRODUCTS``).
+
+        Returns
+        -------
+        str or None
+            Product absolute filename (if any).
+
+        """
+        fname, _ = self.products(img_id).get(product, (None, None))
+        return fname
+
+    def img_ids(self, product=None):
+        """List of the indexed image IDs.
+
+        Parameters
+        ----------
+        product: str, optional
+            Only the images with this product type.
+
+        Returns
+        -------
+        list
+            Sorted image IDs.
+
+        """
+        with self.db as db:
+            if product is None:
+                rows = db.execute('SELECT DISTINCT img_id FROM files ORDER BY img_id')
+            else:
+                rows = db.execute('SELECT DISTINCT img_id FROM files WHERE product = ? '
+                                  'ORDER BY img_id', (product,))
+            return [img_id for img_id, in rows]
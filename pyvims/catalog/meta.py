@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""VIMS metadata catalog module.
+
+The labels fields of the indexed products are extracted
+in parallel (without reading the cubes data) and stored
+in a SQLite table that can be queried.
+
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime as dt
+
+import pvl
+
+from .files import FileIndex, connect
+from ..isis.header import load_label, read_label
+
+
+CATALOG_NAME = '.pyvims_catalog.sqlite'
+
+PDS_END = re.compile(rb'^END\r?$', re.MULTILINE)
+
+COLUMNS = {
+    'img_id': 'TEXT PRIMARY KEY',
+    'target': 'TEXT',
+    'start': 'TEXT',
+    'stop': 'TEXT',
+    'mode_ir': 'TEXT',
+    'mode_vis': 'TEXT',
+    'expo_ir': 'REAL',
+    'expo_vis': 'REAL',
+    'seq': 'TEXT',
+    'seq_title': 'TEXT',
+    'ns': 'INTEGER',
+    'nl': 'INTEGER',
+    'sources': 'TEXT',
+}
+
+FIELDS = [col for col in COLUMNS if col not in ('img_id', 'sources')]
+
+# Indexed columns (range queries)
+INDEXES = ('expo_ir', 'expo_vis')
+
+
+def _time(value):
+    """Convert label time into ISO string (UTC)."""
+    if isinstance(value, str):
+        value = value.rstrip('Z')
+        fmt = '%Y-%jT%H:%M:%S' if re.match(r'^\d{4}-\d{3}T', value) else '%Y-%m-%dT%H:%M:%S'
+        value = dt.strptime(value, fmt + '.%f' if '.' in value else fmt)
+
+    return value.replace(tzinfo=None).strftime('%Y-%m-%dT%H:%M:%S.%f')
+
+
+def _value(value):
+    """Strip label value units."""
+    return getattr(value, 'value', value)
+
+
+def pds_metadata(fname):
+    """Extract metadata from a PDS label (``LBL`` or ``QUB``).
+
+    Only the attached label is read. The keys are looked up in
+    the ``QUBE`` object first (``QUB`` labels) and at the top
+    level of the label otherwise (``LBL`` labels).
+
+    """
+    lbl = pvl.loads(read_label(fname, end=PDS_END))
+    qube = lbl['SPECTRAL_QUBE'] if 'SPECTRAL_QUBE' in lbl else lbl['QUBE']
+    items = dict(zip(qube['AXIS_NAME'], qube['CORE_ITEMS']))
+
+    def get(key):
+        return qube[key] if key in qube else lbl[key]
+
+    expo_ir, expo_vis = get('EXPOSURE_DURATION')[:2]
+    mode_ir, mode_vis = get('SAMPLING_MODE_ID')[:2]
+
+    return {
+        'target': str(get('TARGET_NAME')).upper(),
+        'start': _time(get('START_TIME')),
+        'stop': _time(get('STOP_TIME')),
+        'mode_ir': str(mode_ir),
+        'mode_vis': str(mode_vis),
+        'expo_ir': float(_value(expo_ir)),
+        'expo_vis': float(_value(expo_vis)),
+        'seq': str(get('SEQUENCE_ID')),
+        'seq_title': str(get('SEQUENCE_TITLE')),
+        'ns': int(items['SAMPLE']),
+        'nl': int(items['LINE']),
+    }
+
+
+def isis_metadata(fname):
+    """Extract metadata from an ISIS VIMS cube label (fast parser)."""
+    cube = load_label(fname, objects=('IsisCube',))['IsisCube']
+    inst = cube['Instrument']
+    dims = cube['Core']['Dimensions']
+
+    channel = inst.get('Channel', 'VIS' if '_vis' in fname.lower() else 'IR')
+    channel = str(channel).lower()
+
+    expo = {str(units).lower(): value for value, units in inst['ExposureDuration']}
+
+    return {
+        'target': str(inst['TargetName']).upper(),
+        'start': _time(inst['StartTime']),
+        'stop': _time(inst['StopTime']),
+        f'mode_{channel}': str(inst['SamplingMode']),
+        'expo_ir': float(expo['ir']),
+        'expo_vis': float(expo['vis']),
+        'seq': str(cube['Archive']['SequenceId']),
+        'seq_title': str(cube['Archive']['SequenceTitle']),
+        'ns': int(dims['Samples']),
+        'nl': int(dims['Lines']),
+    }
+
+
+# Metadata extractors by priority
+EXTRACTORS = (
+    ('LBL', pds_metadata),
+    ('QUB', pds_metadata),
+    ('CLN_IR', isis_metadata),
+    ('CLN_VIS', isis_metadata),
+    ('CUB_IR', isis_metadata),
+    ('CUB_VIS', isis_metadata),
+    ('CAL_IR', isis_metadata),
+    ('CAL_VIS', isis_metadata),
+)
+
+
+def sources(products):
+    """Products used to extract the metadata (with their sizes)."""
+    return ';'.join(f'{product}:{products[product][1]}'
+                    for product, _ in EXTRACTORS if product in products)
+
+
+def extract_metadata(args):
+    """Extract the metadata of an image from its products labels.
+
+    Parameters
+    ----------
+    args: (str, dict)
+        Image ID and its products (``{product: (filename, size)}``).
+
+    Returns
+    -------
+    str, dict, str
+        Image ID, metadata and error message (if any).
+
+    """
+    img_id, products = args
+    meta, errors = {}, []
+
+    for product, extractor in EXTRACTORS:
+        if product not in products:
+            continue
+
+        try:
+            values = extractor(products[product][0])
+        except Exception as err:
+            errors.append(f'{product}: {err}')
+            continue
+
+        for key, value in values.items():
+            if meta.get(key) is None:
+                meta[key] = value
+
+        if all(meta.get(field) is not None for field in FIELDS):
+            break
+
+    if not meta:
+        return img_id, None, '; '.join(errors) or 'No label found'
+
+    meta['sources'] = sources(products)
+    return img_id, meta, None
+
+
+class MetaCatalog:
+    """VIMS metadata catalog.
+
+    Parameters
+    ----------
+    index: FileIndex or str, optional
+        Products files index (or data root folder).
+    fname: str, optional
+        Catalog database filename (relative to the root or absolute).
+
+    Note
+    ----
+    Sub-spacecraft geometry is not stored in the VIMS labels
+    and is not included in the catalog.
+
+    """
+
+    def __init__(self, index=None, fname=CATALOG_NAME):
+        if not isinstance(index, FileIndex):
+            index = FileIndex(index)
+
+        self.index = index
+        self.fname = os.path.join(index.root, fname)
+
+        with self.db as db:
+            db.execute('CREATE TABLE IF NOT EXISTS metadata ('
+                       + ', '.join(f'{col} {sql}' for col, sql in COLUMNS.items())
+                       + ')')
+            for col in INDEXES:
+                db.execute(f'CREATE INDEX IF NOT EXISTS metadata_{col} ON metadata ({col})')
+
+    def __str__(self):
+        return self.fname
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> {self} ({len(self)} images)'
+
+    def __len__(self):
+        with self.db as db:
+            return db.execute('SELECT COUNT(*) FROM metadata').fetchone()[0]
+
+    def __contains__(self, img_id):
+        with self.db as db:
+            return db.execute('SELECT 1 FROM metadata WHERE img_id = ?',
+                              (img_id,)).fetchone() is not None
+
+    def __getitem__(self, img_id):
+        with self.db as db:
+            row = db.execute(f'SELECT {", ".join(COLUMNS)} FROM metadata '
+                             'WHERE img_id = ?', (img_id,)).fetchone()
+        if row is None:
+            raise KeyError(f'Image `{img_id}` not found in `{self}`.')
+        return dict(zip(COLUMNS, row))
+
+    @property
+    def db(self):
+        """Catalog database transaction."""
+        return connect(self.fname)
+
+    def build(self, img_ids=None, workers=None, chunksize=16):
+        """Extract the new or modified images metadata.
+
+        Parameters
+        ----------
+        img_ids: list, optional
+            Image IDs to extract (all the indexed images by default).
+        workers: int, optional
+            Number of worker processes (CPU count by default).
+            Use ``1`` to extract the labels in the current process.
+        chunksize: int, optional
+            Number of images sent to the workers at once.
+
+        Returns
+        -------
+        dict
+            Errors messages for the images without metadata.
+
+        """
+        if img_ids is None:
+            img_ids = self.index.img_ids()
+
+        with self.db as db:
+            known = dict(db.execute('SELECT img_id, sources FROM metadata'))
+
+        todo = []
+        for img_id in img_ids:
+            products = self.index.products(img_id)
+            if known.get(img_id) != sources(products):
+                todo.append((img_id, products))
+
+        if workers == 1 or len(todo) <= 1:
+            results = map(extract_metadata, todo)
+            return self._insert(results)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return self._insert(executor.map(extract_metadata, todo,
+                                             chunksize=chunksize))
+
+    def _insert(self, results):
+        """Insert metadata results in the catalog."""
+        errors = {}
+        with self.db as db:
+            for img_id, meta, error in results:
+                if meta is None:
+                    errors[img_id] = error
+                    continue
+
+                meta['img_id'] = img_id
+                db.execute(f'INSERT OR REPLACE INTO metadata ({", ".join(COLUMNS)}) '
+                           f'VALUES ({", ".join("?" * len(COLUMNS))})',
+                           [meta.get(col) for col in COLUMNS])
+        return errors
+
+    def query(self, target=None, start=None, stop=None, mode=None,
+              expo=None, seq=None, ns=None, nl=None):
+        """Query the images matching the metadata.
+
+        Parameters
+        ----------
+        target: str, optional
+            Target name (case insensitive).
+        start: str or datetime, optional
+            Images acquired after this time.
+        stop: str or datetime, optional
+            Images acquired before this time.
+        mode: str, optional
+            IR or VIS sampling mode (``NORMAL``, ``HI-RES``, ...).
+        expo: tuple, optional
+            IR or VIS exposure duration range ``(min, max)`` (ms).
+            A ``None`` bound is not limited.
+        seq: str, optional
+            Sequence ID.
+        ns: int, optional
+            Number of samples.
+        nl: int, optional
+            Number of lines.
+
+        Returns
+        -------
+        list
+            Sorted images IDs.
+
+        """
+        where, args = [], []
+
+        if target is not None:
+            where.append('target = ?')
+            args.append(str(target).upper())
+
+        if start is not None:
+            where.append('stop >= ?')
+            args.append(_time(start))
+
+        if stop is not None:
+            where.append('start <= ?')
+            args.append(_time(stop))
+
+        if mode is not None:
+            where.append('(mode_ir = ? OR mode_vis = ?)')
+            args.extend([mode, mode])
+
+        if expo is not None:
+            low, high = expo
+            low = float('-inf') if low is None else float(low)
+            high = float('inf') if high is None else float(high)
+            where.append('(expo_ir BETWEEN ? AND ? OR expo_vis BETWEEN ? AND ?)')
+            args.extend([low, high, low, high])
+
+        for col, value in (('seq', seq), ('ns', ns), ('nl', nl)):
+            if value is not None:
+                where.append(f'{col} = ?')
+                args.append(value)
+
+        sql = 'SELECT img_id FROM metadata'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+
+        with self.db as db:
+            return [img_id for img_id, in db.execute(sql + ' ORDER BY img_id', args)]
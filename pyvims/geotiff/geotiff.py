@@ -53,23 +53,157 @@ class GeoTiff(object):
         data[data == band.GetNoDataValue()] = np.nan
         return data
 
+    def read_bands(self, bands=None, window=None):
+        '''Read multiple bands in a single I/O call
+
+        Parameters
+        ----------
+        bands: list, optional
+            Bands indexes (1-based). All the bands by default.
+        window: tuple, optional
+            Pixels window `(xoff, yoff, xsize, ysize)`.
+            The full image by default.
+
+        Returns
+        -------
+        numpy.ndarray
+            Bands data `(NB, ysize, xsize)` with NoData set to NaN.
+
+        Note
+        ----
+        The output array is allocated once and filled
+        in place by GDAL (converted to float64 on read).
+        '''
+        if bands is None:
+            bands = range(1, self.bandCount + 1)
+        bands = [int(b) for b in bands]
+
+        if window is None:
+            window = (0, 0, self.ds.RasterXSize, self.ds.RasterYSize)
+        xoff, yoff, xsize, ysize = [int(w) for w in window]
+
+        data = np.empty((len(bands), ysize, xsize))
+
+        # Bands subset only (`band_list` requires GDAL >= 3.5)
+        kwargs = {} if bands == list(range(1, self.bandCount + 1)) else {'band_list': bands}
+        self.ds.ReadAsArray(xoff, yoff, xsize, ysize,
+                            buf_obj=data if len(bands) > 1 else data[0], **kwargs)
+
+        nodata = np.array([self.ds.GetRasterBand(b).GetNoDataValue() for b in bands], dtype=float)
+        data[data == nodata[:, None, None]] = np.nan
+        return data
+
+    def read_all(self):
+        '''Read all the bands at once'''
+        return self.read_bands()
+
     def metadataBand(self, i):
         '''Get band `i` metadata'''
         return self.ds.GetRasterBand(i).GetMetadata()
 
-    def create(self, nx, ny, nb, geotransform, metadata, srs, bands, metadataBands, noDataValue=-1):
-        '''Create GeoTiff file'''
-        ds = gdal.GetDriverByName('GTiff').Create(self.fname, nx, ny, nb, gdal.GDT_Float32, ['COMPRESS=LZW'])
-        ds.SetGeoTransform(geotransform)
-        ds.SetMetadata(metadata)
-        ds.SetProjection(srs.ExportToWkt())
-
-        for B in np.arange(nb):
-            band = ds.GetRasterBand(int(B+1))
-            band.WriteArray(bands[B])
-            band.SetNoDataValue(noDataValue)
-            for key, value in metadataBands[B].items():
-                band.SetMetadataItem(key, str(value))
-
-        ds.FlushCache()
-        del ds
+    @property
+    def wvlns(self):
+        '''Get the bands wavelengths table
+
+        Read from the `VIMS_WVLNS` dataset metadata if present,
+        or from each band `GTIFF_DIM_wvln` metadata otherwise.
+        '''
+        wvlns = self.ds.GetMetadataItem('VIMS_WVLNS')
+        if wvlns:
+            return np.array(wvlns.split(','), dtype=float)
+        return np.array([self.ds.GetRasterBand(i+1).GetMetadataItem('GTIFF_DIM_wvln')
+                         for i in range(self.bandCount)], dtype=float)
+
+    def create(self, nx, ny, nb, geotransform, metadata, srs, bands, metadataBands,
+               noDataValue=-1, codec='LZW', predictor=3, blocksize=256, resampling='AVERAGE'):
+        '''Create Cloud-Optimized GeoTiff file
+
+        The bands are streamed into a temporary tiled file,
+        the overviews are computed and the final file is copied
+        with the tiles and overviews in the COG layout.
+
+        Parameters
+        ----------
+        nx, ny, nb: int
+            GeoTiff dimensions.
+        geotransform: tuple
+            GDAL geotransform.
+        metadata: dict
+            Dataset metadata.
+        srs: osr.SpatialReference
+            Spatial reference.
+        bands: numpy.ndarray or iterable
+            Bands data `(nb, ny, nx)` or generator of `(ny, nx)` images.
+        metadataBands: list
+            Bands metadata dicts.
+        noDataValue: float, optional
+            NoData value.
+        codec: str, optional
+            Compression codec (`LZW`, `DEFLATE`, `ZSTD`, ... or `None`).
+        predictor: int, optional
+            Compression predictor (`3` for floating point, `None` to disable).
+        blocksize: int, optional
+            Tiles size (multiple of 16).
+        resampling: str, optional
+            Overviews resampling method (`None` to disable the overviews).
+        '''
+        tmp = self.name + '.tmp.tif'
+        driver = gdal.GetDriverByName('GTiff')
+
+        try:
+            ds = driver.Create(tmp, nx, ny, nb, gdal.GDT_Float32,
+                               ['TILED=YES', 'BIGTIFF=IF_SAFER',
+                                'BLOCKXSIZE={}'.format(blocksize),
+                                'BLOCKYSIZE={}'.format(blocksize)])
+            if ds is None:
+                raise IOError('The GeoTiff file {} could not be created'.format(tmp))
+            ds.SetGeoTransform(geotransform)
+            ds.SetMetadata(metadata)
+            ds.SetProjection(srs.ExportToWkt())
+
+            count = 0
+            for B, (data, metadataBand) in enumerate(zip(bands, metadataBands)):
+                if B == nb:
+                    break
+                band = ds.GetRasterBand(B + 1)
+                band.SetNoDataValue(noDataValue)
+                band.WriteArray(np.asarray(data, dtype=np.float32))
+                for key, value in metadataBand.items():
+                    band.SetMetadataItem(key, str(value))
+                count += 1
+
+            if count != nb:
+                raise ValueError('Only {} bands provided (expected {})'.format(count, nb))
+
+            if resampling is not None:
+                levels = overviews(nx, ny, blocksize)
+                if levels:
+                    ds.BuildOverviews(resampling, levels)
+
+            options = ['TILED=YES', 'COPY_SRC_OVERVIEWS=YES', 'INTERLEAVE=PIXEL',
+                       'BIGTIFF=IF_SAFER',
+                       'BLOCKXSIZE={}'.format(blocksize),
+                       'BLOCKYSIZE={}'.format(blocksize)]
+            if codec is not None:
+                options.append('COMPRESS={}'.format(codec))
+                if predictor is not None:
+                    options.append('PREDICTOR={}'.format(predictor))
+
+            dst = driver.CreateCopy(self.fname, ds, 0, options)
+            if dst is None:
+                raise IOError('The GeoTiff file {} could not be created'.format(str(self)))
+            dst.FlushCache()
+            del dst
+        finally:
+            ds = None
+            if os.path.isfile(tmp):
+                driver.Delete(tmp)
+
+
+def overviews(nx, ny, blocksize=256):
+    '''Overviews decimation factors down to a single tile'''
+    levels, factor = [], 2
+    while max(nx, ny) > blocksize * factor // 2:
+        levels.append(factor)
+        factor *= 2
+    return levels
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.spatial import Delaunay, cKDTree
+
+try:
+    from scipy.interpolate._interpnd import estimate_gradients_2d_global
+except ImportError:  # SciPy < 1.15
+    from scipy.interpolate.interpnd import estimate_gradients_2d_global
+
+
+METHODS = ('nearest', 'linear', 'cubic')
+
+
+class GridInterpolator(object):
+    '''Scattered points to grid interpolator shared by all the bands.
+
+    The triangulation (or the nearest neighbours tree) and
+    the grid points location are computed only once.
+    The interpolations are stored as a sparse weights matrix
+    applied to all the bands at once. For the `cubic` method
+    (Clough-Tocher scheme), the weights apply to the values
+    and to the gradients estimated on the shared triangulation.
+
+    Parameters
+    ----------
+    x, y: numpy.ndarray
+        Scattered points coordinates (`NaN` points are discarded).
+    X, Y: numpy.ndarray
+        Grid coordinates.
+    method: str, optional
+        Interpolation method (see `scipy.interpolate.griddata` methods).
+
+    Note
+    ----
+    As with `griddata`, the grid points outside the convex hull
+    are set to `NaN` with the `linear` and `cubic` methods.
+    '''
+    def __init__(self, x, y, X, Y, method='linear'):
+        if method not in METHODS:
+            raise ValueError('Interpolation method `{}` invalid. Must be in {}'.format(
+                method, METHODS))
+
+        x, y = np.ravel(x), np.ravel(y)
+        self.valid = np.isfinite(x) & np.isfinite(y)
+        self.points = np.column_stack([x[self.valid], y[self.valid]])
+
+        self.method = method
+        self.shape = np.shape(X)
+        self.xi = np.column_stack([np.ravel(X), np.ravel(Y)])
+
+        if method == 'nearest':
+            _, index = cKDTree(self.points).query(self.xi)
+            self.matrix = self._matrix(np.arange(len(self.xi)), index, np.ones(len(self.xi)))
+            self.outside = None
+            return
+
+        self.tri = Delaunay(self.points)
+        simplex = self.tri.find_simplex(self.xi)
+        self.outside = simplex < 0
+
+        rows = np.flatnonzero(~self.outside)
+        simplex = simplex[rows]
+
+        # Barycentric coordinates of the grid points in their simplex
+        T = self.tri.transform[simplex]
+        b = np.einsum('ijk,ik->ij', T[:, :2], self.xi[rows] - T[:, 2])
+        b = np.column_stack([b, 1 - b.sum(axis=1)])
+
+        vertices = self.tri.simplices[simplex]
+
+        if method == 'linear':
+            self.matrix = self._matrix(np.repeat(rows, 3), vertices.ravel(), b.ravel())
+        else:
+            # Values, x and y gradients weights
+            npts = len(self.points)
+            cols = np.hstack([vertices, vertices + npts, vertices + 2 * npts])
+            weights = clough_tocher(self.tri, simplex, b)
+            self.matrix = self._matrix(np.repeat(rows, 9), cols.ravel(), weights.ravel(),
+                                       ncols=3 * npts)
+
+    def __repr__(self):
+        return '<GridInterpolator: {} | {} points -> {}>'.format(
+            self.method, len(self.points), self.shape)
+
+    def arrays(self):
+        '''Interpolator arrays (see `from_arrays`)
+
+        The grid coordinates and the triangulation
+        are not included (only the interpolation weights).
+        '''
+        return {
+            'method': np.array(self.method),
+            'shape': np.array(self.shape),
+            'valid': self.valid,
+            'points': self.points,
+            'outside': np.array([], dtype=bool) if self.outside is None else self.outside,
+            'data': self.matrix.data,
+            'indices': self.matrix.indices,
+            'indptr': self.matrix.indptr,
+            'matrix_shape': np.array(self.matrix.shape),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        '''Rebuild an interpolator from its arrays
+
+        The triangulation is recomputed for the
+        `cubic` method (gradients estimate).
+        '''
+        interp = cls.__new__(cls)
+        interp.method = str(arrays['method'])
+        interp.shape = tuple(int(n) for n in arrays['shape'])
+        interp.valid = arrays['valid']
+        interp.points = arrays['points']
+        interp.outside = arrays['outside'] if interp.method != 'nearest' else None
+        interp.matrix = csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                                   shape=tuple(arrays['matrix_shape']))
+        interp.xi = None
+
+        if interp.method == 'cubic':
+            interp.tri = Delaunay(interp.points)
+
+        return interp
+
+    def _matrix(self, rows, cols, weights, ncols=None):
+        '''Sparse interpolation weights matrix'''
+        return csr_matrix((weights, (rows, cols)),
+                          shape=(len(self.xi), ncols or len(self.points)))
+
+    def _interp(self, values, out):
+        '''Interpolate bands values `(nb, N)` into `out` `(nb, ny * nx)`'''
+        values = values.T
+
+        if self.method == 'cubic':
+            grad = estimate_gradients_2d_global(self.tri, values, tol=1e-6)
+            values = np.vstack([values, grad[..., 0], grad[..., 1]])
+
+        out[:] = (self.matrix @ values).T
+        if self.outside is not None:
+            out[:, self.outside] = np.nan
+
+    def __call__(self, values, workers=1):
+        '''Interpolate the values on the grid
+
+        Parameters
+        ----------
+        values: numpy.ndarray
+            Values `(N)` or bands values `(NB, N)`
+            on the scattered points.
+        workers: int, optional
+            Number of threads. The bands are split in
+            chunks interpolated in parallel (the SciPy
+            routines release the GIL).
+
+        Returns
+        -------
+        numpy.ndarray
+            Interpolated grid `(ny, nx)` or `(NB, ny, nx)`.
+        '''
+        values = np.asarray(values, dtype=float)
+        ndim = values.ndim
+        values = np.atleast_2d(values)[:, self.valid]
+
+        nb = len(values)
+        out = np.empty((nb, self.matrix.shape[0]))
+
+        nchunks = max(1, min(int(workers), nb))
+        if nchunks == 1:
+            self._interp(values, out)
+        else:
+            bounds = np.linspace(0, nb, nchunks + 1).astype(int)
+            chunks = [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+            with ThreadPoolExecutor(max_workers=nchunks) as executor:
+                list(executor.map(lambda chunk: self._interp(values[chunk], out[chunk]),
+                                  chunks))
+
+        out = out.reshape((nb,) + self.shape)
+        return out[0] if ndim == 1 else out
+
+
+def clough_tocher(tri, simplex, b):
+    '''Clough-Tocher interpolation weights
+
+    Vectorized port of the SciPy `CloughTocher2DInterpolator`
+    evaluation. The interpolated value is linear in the
+    vertices values `f` and gradients `df` of the simplex.
+
+    Parameters
+    ----------
+    tri: scipy.spatial.Delaunay
+        Triangulation.
+    simplex: numpy.ndarray
+        Simplex of each grid point `(N)`.
+    b: numpy.ndarray
+        Barycentric coordinates of the grid points `(N, 3)`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Weights `(N, 9)` of the vertices values `(f1, f2, f3)`,
+        x gradients `(df1x, df2x, df3x)` and y gradients
+        `(df1y, df2y, df3y)`.
+    '''
+    p1, p2, p3 = tri.points[tri.simplices[simplex]].transpose(1, 2, 0)[..., None]
+
+    e12, e23, e31 = p2 - p1, p3 - p2, p1 - p3
+    e14, e24, e34 = (e12 - e31) / 3, (e23 - e12) / 3, (e31 - e23) / 3
+
+    # Values and gradients basis (one weight per column)
+    f1, f2, f3, d1x, d2x, d3x, d1y, d2y, d3y = np.eye(9)
+
+    df12 = d1x * e12[0] + d1y * e12[1]
+    df21 = -(d2x * e12[0] + d2y * e12[1])
+    df23 = d2x * e23[0] + d2y * e23[1]
+    df32 = -(d3x * e23[0] + d3y * e23[1])
+    df31 = d3x * e31[0] + d3y * e31[1]
+    df13 = -(d1x * e31[0] + d1y * e31[1])
+
+    c3000, c0300, c0030 = f1, f2, f3
+    c2100 = (df12 + 3 * c3000) / 3
+    c2010 = (df13 + 3 * c3000) / 3
+    c1200 = (df21 + 3 * c0300) / 3
+    c0210 = (df23 + 3 * c0300) / 3
+    c1020 = (df31 + 3 * c0030) / 3
+    c0120 = (df32 + 3 * c0030) / 3
+
+    c2001 = (c2100 + c2010 + c3000) / 3
+    c0201 = (c1200 + c0300 + c0210) / 3
+    c0021 = (c1020 + c0120 + c0030) / 3
+
+    # Affine invariant edges normal derivatives directions
+    # (centroid of the neighbour simplex in local coordinates)
+    g = np.full((3, len(simplex), 1), -.5)
+    for k, (i, j) in enumerate([(2, 1), (0, 2), (1, 0)]):
+        neighbor = tri.neighbors[simplex, k]
+        has = neighbor >= 0
+
+        y = tri.points[tri.simplices[neighbor[has]]].sum(axis=1) / 3
+        T = tri.transform[simplex[has]]
+        c = np.einsum('ijk,ik->ij', T[:, :2], y - T[:, 2])
+        c = np.column_stack([c, 1 - c.sum(axis=1)])
+
+        g[k, has, 0] = (2 * c[:, i] + c[:, j] - 1) / (2 - 3 * c[:, i] - 3 * c[:, j])
+
+    c0111 = (g[0] * (-c0300 + 3 * c0210 - 3 * c0120 + c0030)
+             + (-c0300 + 2 * c0210 - c0120 + c0021 + c0201)) / 2
+    c1011 = (g[1] * (-c0030 + 3 * c1020 - 3 * c2010 + c3000)
+             + (-c0030 + 2 * c1020 - c2010 + c2001 + c0021)) / 2
+    c1101 = (g[2] * (-c3000 + 3 * c2100 - 3 * c1200 + c0300)
+             + (-c3000 + 2 * c2100 - c1200 + c2001 + c0201)) / 2
+
+    c1002 = (c1101 + c1011 + c2001) / 3
+    c0102 = (c1101 + c0111 + c0201) / 3
+    c0012 = (c1011 + c0111 + c0021) / 3
+
+    c0003 = (c1002 + c0102 + c0012) / 3
+
+    # Extended barycentric coordinates
+    minval = b.min(axis=1, keepdims=True)
+    b1, b2, b3 = (b - minval).T[..., None]
+    b4 = 3 * minval
+
+    return (b1 ** 3 * c3000 + 3 * b1 ** 2 * b2 * c2100 + 3 * b1 ** 2 * b3 * c2010
+            + 3 * b1 ** 2 * b4 * c2001 + 3 * b1 * b2 ** 2 * c1200
+            + 6 * b1 * b2 * b4 * c1101 + 3 * b1 * b3 ** 2 * c1020 + 6 * b1 * b3 * b4 * c1011
+            + 3 * b1 * b4 ** 2 * c1002 + b2 ** 3 * c0300 + 3 * b2 ** 2 * b3 * c0210
+            + 3 * b2 ** 2 * b4 * c0201 + 3 * b2 * b3 ** 2 * c0120 + 6 * b2 * b3 * b4 * c0111
+            + 3 * b2 * b4 ** 2 * c0102 + b3 ** 3 * c0030 + 3 * b3 ** 2 * b4 * c0021
+            + 3 * b3 * b4 ** 2 * c0012 + b4 ** 3 * c0003)
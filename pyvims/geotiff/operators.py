@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+import os
+import sqlite3
+import time
+from collections import OrderedDict, namedtuple
+from hashlib import sha1
+from io import BytesIO
+
+import numpy as np
+
+from ..cache import database
+from .interp import GridInterpolator
+from .ortho import grid as ortho_grid
+
+
+Operator = namedtuple('Operator', 'interpolator geotransform')
+
+
+def operator_key(lon, lat, limb, lat_0, lon_0, R, npt, method):
+    '''Reprojection operator hash key
+
+    Based on the navigation arrays content and
+    on the projection and interpolation parameters.
+    '''
+    h = sha1()
+    for arr in (lon, lat, limb):
+        arr = np.ascontiguousarray(arr)
+        h.update(str((arr.dtype.str, arr.shape)).encode())
+        h.update(arr.tobytes())
+    h.update(repr((float(lat_0), float(lon_0), float(R), int(npt), method)).encode())
+    return h.hexdigest()
+
+
+def reprojection(lon, lat, limb, lat_0, lon_0, R, npt, method='linear'):
+    '''Compute the orthographic reprojection operator
+
+    Returns
+    -------
+    Operator
+        Grid interpolator and GeoTiff geotransform.
+    '''
+    x, y, X, Y, geotransform = ortho_grid(lat[~limb], lon[~limb], lat_0, lon_0, R, npt)
+    return Operator(GridInterpolator(x, y, X, Y, method=method), geotransform)
+
+
+def dumps(operator):
+    '''Serialize a reprojection operator (NumPy arrays archive)'''
+    buf = BytesIO()
+    np.savez(buf, geotransform=np.array(operator.geotransform, dtype=float),
+             **operator.interpolator.arrays())
+    return buf.getvalue()
+
+
+def loads(data):
+    '''Load a serialized reprojection operator
+
+    Only plain NumPy arrays are loaded (pickled objects
+    are not allowed).
+    '''
+    with np.load(BytesIO(data), allow_pickle=False) as archive:
+        arrays = dict(archive)
+    geotransform = tuple(arrays.pop('geotransform').tolist())
+    return Operator(GridInterpolator.from_arrays(arrays), geotransform)
+
+
+class OperatorCache(object):
+    '''Reprojection operators cache
+
+    The operators are kept in memory (least recently used first
+    discarded) and optionally stored on disk in a SQLite database
+    (NumPy arrays archives, least recently used first discarded).
+
+    Parameters
+    ----------
+    maxsize: int, optional
+        Maximum number of operators kept in memory.
+    fname: str, optional
+        Cache database filename (memory only if not provided).
+    maxrows: int, optional
+        Maximum number of operators stored on disk.
+    '''
+    def __init__(self, maxsize=8, fname=None, maxrows=256):
+        self.maxsize = maxsize
+        self.fname = fname
+        self.maxrows = maxrows
+        self.operators = OrderedDict()
+
+        if fname is not None:
+            with self.db as db:
+                db.execute('CREATE TABLE IF NOT EXISTS reprojections ('
+                           'key TEXT PRIMARY KEY, operator BLOB, atime REAL)')
+
+    def __repr__(self):
+        return '<OperatorCache: {} operators in memory{}>'.format(
+            len(self), '' if self.fname is None else ' | ' + self.fname)
+
+    def __len__(self):
+        return len(self.operators)
+
+    def __contains__(self, key):
+        return key in self.operators
+
+    @property
+    def db(self):
+        '''Cache database transaction'''
+        return database(self.fname)
+
+    @property
+    def nrows(self):
+        '''Number of operators stored on disk'''
+        if self.fname is None:
+            return 0
+
+        with self.db as db:
+            return db.execute('SELECT COUNT(*) FROM reprojections').fetchone()[0]
+
+    def _load(self, key):
+        '''Load operator from the disk cache'''
+        if self.fname is None:
+            return None
+
+        try:
+            with self.db as db:
+                row = db.execute('SELECT operator FROM reprojections WHERE key = ?',
+                                 (key,)).fetchone()
+                if row is not None:
+                    db.execute('UPDATE reprojections SET atime = ? WHERE key = ?',
+                               (time.time(), key))
+        except sqlite3.OperationalError:
+            return None  # Locked database: the operator is recomputed
+
+        if row is None:
+            return None
+
+        try:
+            return loads(row[0])
+        except (ValueError, KeyError, OSError):
+            return None  # Invalid stored operator: recomputed and replaced
+
+    def _dump(self, key, operator):
+        '''Store operator in the disk cache
+
+        The least recently used operators are
+        discarded above `maxrows` operators.
+        '''
+        if self.fname is None:
+            return
+
+        try:
+            with self.db as db:
+                db.execute('INSERT OR REPLACE INTO reprojections VALUES (?, ?, ?)',
+                           (key, dumps(operator), time.time()))
+                db.execute('DELETE FROM reprojections WHERE key NOT IN ('
+                           'SELECT key FROM reprojections ORDER BY atime DESC LIMIT ?)',
+                           (self.maxrows,))
+        except sqlite3.OperationalError:
+            pass  # Locked database: the operator is only kept in memory
+
+    def _store(self, key, operator):
+        '''Store operator in memory'''
+        self.operators[key] = operator
+        self.operators.move_to_end(key)
+        while len(self.operators) > self.maxsize:
+            self.operators.popitem(last=False)
+
+    def get(self, lon, lat, limb, lat_0, lon_0, R, npt, method='linear'):
+        '''Get the reprojection operator from the cache or compute it
+
+        Parameters
+        ----------
+        lon, lat: numpy.ndarray
+            Pixels navigation `(NL, NS)`.
+        limb: numpy.ndarray
+            Pixels limb mask `(NL, NS)` (excluded pixels).
+        lat_0, lon_0: float
+            Orthographic projection center.
+        R: float
+            Target radius (km).
+        npt: int
+            Number of pixels in the projected grid.
+        method: str, optional
+            Interpolation method.
+
+        Returns
+        -------
+        Operator
+            Grid interpolator and GeoTiff geotransform.
+        '''
+        key = operator_key(lon, lat, limb, lat_0, lon_0, R, npt, method)
+
+        if key in self.operators:
+            self.operators.move_to_end(key)
+            return self.operators[key]
+
+        operator = self._load(key)
+        if operator is None:
+            operator = reprojection(lon, lat, limb, lat_0, lon_0, R, npt, method)
+            self._dump(key, operator)
+
+        self._store(key, operator)
+        return operator
+
+    def clear(self):
+        '''Remove all the cached operators'''
+        self.operators.clear()
+        if self.fname is not None:
+            with self.db as db:
+                db.execute('DELETE FROM reprojections')
+
+
+OPERATORS = OperatorCache(fname=os.environ.get('VIMS_OPERATORS_CACHE'))
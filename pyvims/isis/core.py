@@ -0,0 +1,150 @@
+"""ISIS cube core module."""
+
+import numpy as np
+
+from .special import special_pixels
+from .tiles import ISISTiles
+
+
+def outer_index(data, keys):
+    """Index each axis of the data independently.
+
+    Basic keys (``int`` and ``slice``) are applied first
+    to get a view on the data before the fancy indexes
+    (lists, arrays and boolean masks) are applied one axis
+    at the time.
+
+    Parameters
+    ----------
+    data: numpy.ndarray
+        Input data.
+    keys: tuple
+        Keys for each axis.
+
+    Returns
+    -------
+    numpy.ndarray
+        Indexed data.
+
+    """
+    basic = tuple(
+        k if isinstance(k, (int, np.integer, slice)) else slice(None)
+        for k in keys)
+
+    data = data[basic]
+
+    axis = 0
+    for key in keys:
+        if isinstance(key, (int, np.integer)):
+            continue
+
+        if not isinstance(key, slice):
+            data = data[(slice(None),) * axis + (np.asarray(key),)]
+
+        axis += 1
+
+    return data
+
+
+class ISISCore:
+    """Lazy scaled view on ISIS cube core data.
+
+    The raw core values are only read (and scaled)
+    on the requested slices.
+
+    Parameters
+    ----------
+    raw: numpy.memmap
+        Raw core data with a ``(NB, NL, NS)`` shape.
+    mult: float, optional
+        Core data multiplication factor.
+    base: float, optional
+        Core data base factor.
+    special: str, optional
+        ISIS special pixels decoding:
+            - ``nan``: replaced by ``NaN``.
+            - ``mask``: masked in a ``numpy.ma.MaskedArray``.
+            - ``None``: kept as scaled values.
+    pixel_type: str, optional
+        ISIS pixel type (required to decode the special pixels).
+
+    """
+
+    def __init__(self, raw, mult=1, base=0, special=None, pixel_type=None):
+        self.raw = raw
+        self.mult = mult
+        self.base = base
+        self.special = special
+        self.pixel_type = pixel_type
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> Shape: {self.shape}'
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        return self._scale(self.raw[key])
+
+    def __array__(self, dtype=None):
+        data = self[...]
+        return data if dtype is None else data.astype(dtype)
+
+    def read(self, keys):
+        """Read and scale the data with an outer indexing on each axis.
+
+        Parameters
+        ----------
+        keys: tuple
+            Keys on each axis.
+
+        Returns
+        -------
+        numpy.ndarray
+            Scaled core data.
+
+        """
+        if isinstance(self.raw, ISISTiles):
+            return self._scale(self.raw[keys])
+
+        return self._scale(outer_index(self.raw, keys))
+
+    @property
+    def shape(self):
+        """Core shape."""
+        return self.raw.shape
+
+    @property
+    def ndim(self):
+        """Core number of dimensions."""
+        return len(self.shape)
+
+    @property
+    def size(self):
+        """Core number of values."""
+        return int(np.prod(self.shape))
+
+    @property
+    def dtype(self):
+        """Scaled core data type."""
+        return np.dtype(float)
+
+    def _scale(self, data):
+        """Apply base and multiplier on raw data and decode special pixels."""
+        raw = np.asarray(data)
+        data = raw * self.mult + self.base
+
+        if self.special is None or self.pixel_type is None:
+            return data
+
+        mask = special_pixels(raw, self.pixel_type).astype(bool)
+
+        if self.special == 'mask':
+            return np.ma.masked_array(data, mask=mask)
+
+        if self.special == 'nan':
+            data[mask] = np.nan
+            return data
+
+        raise ValueError(f'Special pixels mode `{self.special}` invalid. '
+                         'Use `nan`, `mask` or `None`.')
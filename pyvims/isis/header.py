@@ -0,0 +1,324 @@
+"""Fast ISIS label header module."""
+
+import re
+from collections import namedtuple
+from datetime import datetime as dt
+
+from .errors import ISISError
+
+
+END = re.compile(rb'^End\r?$', re.MULTILINE)
+START_BYTE = re.compile(rb'^\s*StartByte\s*=\s*(\d+)\r?\n', re.MULTILINE)
+QUOTED = re.compile(r'"[^"]*"')
+COMMENTS = re.compile(r'"[^"]*"|/\*.*?\*/', re.DOTALL)
+UNITS = re.compile(r'^(.*?)\s*<([^<>]*)>$', re.DOTALL)
+ITEMS = re.compile(r'"[^"]*"|\([^()]*\)|[^,]+')
+
+INT = re.compile(r'^[+-]?\d+$')
+BASED = re.compile(r'^([+-]?)(\d+)#([0-9A-Fa-f]+)#$')
+FLOAT = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$')
+DOY = re.compile(r'^\d{4}-\d{3}T\d{2}:\d{2}:\d{2}(\.\d+)?Z?$')
+YMD = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?Z?$')
+
+Units = namedtuple('Units', 'value units')
+
+BLOCKS = ('Object', 'Group')
+END_BLOCKS = ('End_Object', 'End_Group')
+
+# Top level objects parsed in the fast label
+OBJECTS = ('IsisCube', 'Label', 'Table')
+
+
+class ISISBlock(list):
+    """ISIS label block.
+
+    Ordered collection of ``(key, value)`` items.
+    The keys can be repeated (eg. ``Table`` or ``Field``),
+    a key lookup returns its first value.
+
+    """
+
+    def __init__(self, items=()):
+        super().__init__()
+        self.__index = {}
+        for key, value in items:
+            self.append((key, value))
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> Keys: {list(self.keys())}'
+
+    def __contains__(self, key):
+        return key in self.__index
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return self.__index[key]
+            except KeyError:
+                raise KeyError(f'Key `{key}` not found.')
+        return super().__getitem__(key)
+
+    def append(self, item):
+        """Append a new ``(key, value)`` item."""
+        key, value = item
+        self.__index.setdefault(key, value)
+        super().append(item)
+
+    def get(self, key, default=None):
+        """Get the first value of a key."""
+        return self.__index.get(key, default)
+
+    def keys(self):
+        """List of unique keys."""
+        return self.__index.keys()
+
+    def values(self):
+        """List of all the values."""
+        return [value for _, value in self]
+
+    def items(self):
+        """List of all the items."""
+        return list(self)
+
+
+# Maximum label size (bytes)
+MAX_LABEL = 4 * 1024 * 1024
+
+
+def read_label_bytes(filename, chunk=65536, end=END, maxsize=MAX_LABEL):
+    """Read only the label bytes of a file.
+
+    The file is read by chunks until the
+    top level ``End`` statement is found.
+    The label can not extend beyond the first
+    data ``StartByte`` nor ``maxsize`` bytes.
+
+    Parameters
+    ----------
+    filename: str
+        Label filename.
+    chunk: int, optional
+        Chunk size (bytes).
+    end: re.Pattern, optional
+        Label end statement pattern (eg. ``END`` for PDS labels).
+    maxsize: int, optional
+        Maximum label size (bytes).
+
+    Returns
+    -------
+    bytes
+        Label content (up to the end of the end statement).
+
+    Raises
+    ------
+    ISISError
+        If the end statement is not found within the label size.
+
+    """
+    data, limit = bytearray(), maxsize
+    with open(filename, 'rb') as f:
+        while True:
+            block = f.read(min(chunk, limit + 1 - len(data)))
+            start = max(len(data) - 64, 0)
+            data += block
+
+            # Data start bytes (1-based) bound the label size
+            for match in START_BYTE.finditer(data, start):
+                limit = min(limit, int(match[1]) - 1)
+
+            match = end.search(data, start)
+
+            # Statement at the end of the chunk could be truncated
+            if match and (match.end() < len(data) or not block):
+                if match.end() <= limit:
+                    return bytes(data[:match.end()])
+                break
+
+            if not block or len(data) > limit:
+                break
+
+    raise ISISError(f'Label end statement not found in the first '
+                    f'{min(limit, len(data))} bytes of `{filename}`.')
+
+
+def read_label(filename, chunk=65536, end=END, maxsize=MAX_LABEL):
+    """Read only the label of an ISIS file.
+
+    See :py:func:`read_label_bytes` for the parameters.
+
+    Returns
+    -------
+    str
+        ISIS label content.
+
+    Raises
+    ------
+    ISISError
+        If the end statement is not found within the label size.
+
+    """
+    return read_label_bytes(filename, chunk=chunk, end=end,
+                            maxsize=maxsize).decode('utf-8', errors='replace')
+
+
+def _time(value):
+    """Parse PVL time string."""
+    value = value.rstrip('Z')
+    date, _, frac = value.partition('.')
+    fmt = '%Y-%jT%H:%M:%S' if DOY.match(value) else '%Y-%m-%dT%H:%M:%S'
+
+    if frac:
+        return dt.strptime(f'{date}.{frac[:6]}', fmt + '.%f')
+
+    return dt.strptime(date, fmt)
+
+
+def parse_value(value):
+    """Parse PVL value string.
+
+    Parameters
+    ----------
+    value: str
+        Raw PVL value.
+
+    Returns
+    -------
+    int, float, str, datetime, list or Units
+        Parsed value.
+
+    """
+    value = value.strip()
+
+    if value.startswith('"') and value.endswith('"') and len(value) > 1:
+        return ' '.join(value[1:-1].split())
+
+    units = UNITS.match(value)
+    if units:
+        return Units(parse_value(units[1]), units[2].strip())
+
+    if value[:1] in '({' and value[-1:] in ')}':
+        return [parse_value(item) for item in ITEMS.findall(value[1:-1])
+                if item.strip()]
+
+    if INT.match(value):
+        return int(value)
+
+    based = BASED.match(value)
+    if based:
+        sign = -1 if based[1] == '-' else 1
+        return sign * int(based[3], int(based[2]))
+
+    if FLOAT.match(value):
+        return float(value)
+
+    if DOY.match(value) or YMD.match(value):
+        return _time(value)
+
+    return value
+
+
+def _uncomment(match):
+    """Remove the comments but keep the quoted strings."""
+    return match[0] if match[0].startswith('"') else ''
+
+
+def _open(statement):
+    """Check if a statement continues on the next line.
+
+    The quotes and the brackets are only
+    counted outside the quoted strings.
+
+    """
+    bare = QUOTED.sub('', statement)
+    return '"' in bare \
+        or bare.count('(') > bare.count(')') \
+        or bare.count('{') > bare.count('}')
+
+
+def _statements(label):
+    """Split PVL label in ``(key, value)`` statements."""
+    buffer = ''
+    for line in COMMENTS.sub(_uncomment, label).splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        buffer = f'{buffer} {line}' if buffer else line
+
+        if _open(buffer):
+            continue
+
+        key, _, value = buffer.partition('=')
+        buffer = ''
+
+        yield key.strip(), value.strip()
+
+
+def parse_label(label, objects=OBJECTS):
+    """Parse ISIS label with a streamlined PVL tokenizer.
+
+    Parameters
+    ----------
+    label: str
+        ISIS label content.
+    objects: tuple, optional
+        Top level objects/groups to parse.
+        The other ones are skipped.
+
+    Returns
+    -------
+    ISISBlock
+        Parsed label.
+
+    """
+    root = ISISBlock()
+    stack = [root]
+    skip = 0
+
+    for key, value in _statements(label):
+        if skip:
+            if key in BLOCKS:
+                skip += 1
+            elif key in END_BLOCKS:
+                skip -= 1
+            continue
+
+        if key in BLOCKS:
+            if len(stack) == 1 and value not in objects:
+                skip = 1
+                continue
+
+            block = ISISBlock()
+            stack[-1].append((value, block))
+            stack.append(block)
+
+        elif key in END_BLOCKS:
+            if len(stack) > 1:
+                stack.pop()
+
+        elif key == 'End':
+            break
+
+        else:
+            stack[-1].append((key, parse_value(value)))
+
+    return root
+
+
+def load_label(filename, objects=OBJECTS):
+    """Load ISIS label header (fast parser).
+
+    Parameters
+    ----------
+    filename: str
+        ISIS filename.
+    objects: tuple, optional
+        Top level objects/groups to parse.
+
+    Returns
+    -------
+    ISISBlock
+        Parsed label.
+
+    """
+    return parse_label(read_label(filename), objects=objects)
@@ -4,11 +4,14 @@ import os
 
 import numpy as np
 
-import pvl
-
+from ..cache import load_cached
+from .core import ISISCore, outer_index
 from .errors import ISISError
+from .header import load_label
 from .labels import ISISLabels
+from .special import special_pixels
 from .tables import ISISTables
+from .tiles import ISISTiles, untile
 from .time import time as _dt
 from .vars import BYTE_ORDERS, FIELD_TYPES
 
@@ -19,10 +22,19 @@ class ISISCube:
     ----------
     filename: str
         Input ISIS filename.
+    mmap: bool, optional
+        Memory-map the cube core instead of loading it in memory.
+        The data are only read and scaled on the requested slices.
+    special: str, optional
+        ISIS special pixels (``NULL``, ``LRS``, ``LIS``, ``HIS``
+        and ``HRS``) decoding: replaced by ``NaN`` (``nan``, default),
+        masked (``mask``) or kept as raw scaled values (``None``).
 
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, mmap=False, special='nan'):
+        self.mmap = mmap
+        self.special = special
         self.filename = filename
 
     def __str__(self):
@@ -51,6 +63,7 @@ class ISISCube:
     def filename(self, filename):
         self.__filename = filename
         self.__pvl = None
+        self.__label = None
         self.__labels = None
         self.__tables = None
         self.__cube = None
@@ -78,9 +91,22 @@ class ISISCube:
     def pvl(self):
         """Full ISIS header in PVL format."""
         if self.__pvl is None:
-            self.__pvl = pvl.load(self.filename)
+            self.__pvl = load_cached(self.filename)
         return self.__pvl
 
+    @property
+    def label(self):
+        """Fast ISIS label.
+
+        Only the label bytes are read and only the ``IsisCube``,
+        ``Label`` and ``Table`` objects are parsed. Use
+        :py:attr:`pvl` to get the full PVL header.
+
+        """
+        if self.__label is None:
+            self.__label = load_cached(self.filename, load_label)
+        return self.__label
+
     @property
     def labels(self):
         """ISIS label labels."""
@@ -92,7 +118,7 @@ class ISISCube:
     def tables(self):
         """ISIS tables."""
         if self.__tables is None:
-            self.__tables = ISISTables(self.filename, self.pvl)
+            self.__tables = ISISTables(self.filename, self.label)
         return self.__tables
 
     def keys(self):
@@ -102,7 +128,7 @@ class ISISCube:
     @property
     def header(self):
         """Main ISIS Cube header."""
-        return self.pvl['IsisCube']
+        return self.label['IsisCube']
 
     @property
     def _core(self):
@@ -151,10 +177,36 @@ class ISISCube:
         """Cube data start byte."""
         return self._core['StartByte'] - 1
 
+    @property
+    def _format(self):
+        """Cube storage format."""
+        return self._core['Format']
+
+    @property
+    def is_tiled(self):
+        """Check if the cube is stored in tiles."""
+        return self._format == 'Tile'
+
+    @property
+    def _tiles_shape(self):
+        """Cube tiles shape ``(NB, TL, TS, TileLines, TileSamples)``."""
+        tile_lines = self._core['TileLines']
+        tile_samples = self._core['TileSamples']
+        return (self.NB,
+                -(-self.NL // tile_lines),
+                -(-self.NS // tile_samples),
+                tile_lines,
+                tile_samples)
+
+    @property
+    def _raw_shape(self):
+        """Cube data shape on disk."""
+        return self._tiles_shape if self.is_tiled else self.shape
+
     @property
     def _nbytes(self):
         """Cube data bytes size."""
-        return self.NB * self.NL * self.NS * self.dtype.itemsize
+        return int(np.prod(self._raw_shape)) * self.dtype.itemsize
 
     @property
     def _base(self):
@@ -166,6 +218,27 @@ class ISISCube:
         """Cube data multiplication factor."""
         return self._pix['Multiplier']
 
+    @property
+    def _pixel_type(self):
+        """Cube pixel type."""
+        return self._pix['Type']
+
+    @property
+    def specials(self):
+        """Special pixels bitmask plane.
+
+        See Also
+        --------
+        :py:func:`pyvims.isis.special.special_pixels`
+
+        """
+        return special_pixels(self.raw[...], self._pixel_type)
+
+    def _core_data(self, raw):
+        """Scaled core data view."""
+        return ISISCore(raw, mult=self._mult, base=self._base,
+                        special=self.special, pixel_type=self._pixel_type)
+
     @property
     def cube(self):
         """ISIS cube."""
@@ -173,14 +246,71 @@ class ISISCube:
             self.__cube = self._load_data()
         return self.__cube
 
+    @property
+    def raw(self):
+        """Read-only memory-mapped raw cube core.
+
+        Tiled cubes are wrapped in :py:class:`ISISTiles` to
+        only read the tiles overlapping the requested slices.
+
+        """
+        data = np.memmap(self.filename, dtype=self.dtype, mode='r',
+                         offset=self._start_byte, shape=self._raw_shape)
+
+        if self.is_tiled:
+            return ISISTiles(data, self.shape)
+
+        return data
+
     def _load_data(self):
-        """Load ISIS table data."""
+        """Load ISIS cube data."""
+        if self.mmap:
+            return self._core_data(self.raw)
+
         with open(self.filename, 'rb') as f:
             f.seek(self._start_byte)
             data = f.read(self._nbytes)
 
-        data = np.frombuffer(data, dtype=self.dtype) * self._mult + self._base
-        return np.reshape(data, self.shape)
+        data = np.frombuffer(data, dtype=self.dtype)
+
+        if self.is_tiled:
+            data = untile(np.reshape(data, self._tiles_shape), self.NL, self.NS)
+
+        return self._core_data(np.reshape(data, self.shape))[...]
+
+    def read(self, bands=None, lines=None, samples=None):
+        """Read a sub-cube without loading the full core.
+
+        Only the bytes ranges required are read from
+        the file (with a memory-mapped access on the core).
+
+        Parameters
+        ----------
+        bands: int, slice or list, optional
+            Band(s) index(es) (0-based). Default: all the bands.
+        lines: int, slice or list, optional
+            Line(s) index(es) (0-based). Default: all the lines.
+        samples: int, slice or list, optional
+            Sample(s) index(es) (0-based). Default: all the samples.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sub-cube data. Each axis is indexed independently
+            and the axes with an ``int`` key are removed.
+
+        """
+        keys = tuple(
+            slice(None) if key is None else key
+            for key in (bands, lines, samples))
+
+        if self.__cube is not None and not self.mmap:
+            return outer_index(self.__cube, keys)
+
+        if self.mmap:
+            return self.cube.read(keys)
+
+        return self._core_data(self.raw).read(keys)
 
     @property
     def _bands(self):
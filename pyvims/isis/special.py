@@ -0,0 +1,79 @@
+"""ISIS special pixels module."""
+
+import numpy as np
+
+from .vars import SPECIAL_PIXELS
+
+
+# Special pixels bitmask flags
+NULL = 1
+LRS = 2
+LIS = 4
+HIS = 8
+HRS = 16
+
+FLAGS = {
+    'Null': NULL,
+    'Lrs': LRS,
+    'Lis': LIS,
+    'His': HIS,
+    'Hrs': HRS,
+}
+
+
+def special_values(pixel_type, dtype):
+    """ISIS special pixels values and flags.
+
+    Parameters
+    ----------
+    pixel_type: str
+        ISIS pixel type (``Real``, ``SignedWord``, ...).
+    dtype: numpy.dtype
+        Raw data type.
+
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray
+        Sorted special values (in the raw data type)
+        and their corresponding bitmask flags.
+
+    """
+    if pixel_type not in SPECIAL_PIXELS:
+        raise KeyError(f'Pixel type `{pixel_type}` has no special pixels.')
+
+    names = list(SPECIAL_PIXELS[pixel_type].keys())
+    values = np.array(list(SPECIAL_PIXELS[pixel_type].values()))
+
+    if dtype.kind == 'f':
+        values = values.astype(f'u{dtype.itemsize}').view(f'f{dtype.itemsize}')
+
+    values = values.astype(dtype)
+    flags = np.array([FLAGS[name] for name in names], dtype=np.uint8)
+
+    order = np.argsort(values)
+    return values[order], flags[order]
+
+
+def special_pixels(data, pixel_type):
+    """ISIS special pixels bitmask.
+
+    Parameters
+    ----------
+    data: numpy.ndarray
+        Raw (unscaled) ISIS data.
+    pixel_type: str
+        ISIS pixel type.
+
+    Returns
+    -------
+    numpy.ndarray
+        Special pixels bitmask plane (``uint8``) with the same
+        shape as the input data. Valid pixels are set to ``0``.
+
+    """
+    data = np.asarray(data)
+    values, flags = special_values(pixel_type, data.dtype)
+
+    i = np.searchsorted(values, data).clip(max=len(values) - 1)
+
+    return np.where(values[i] == data, flags[i], np.uint8(0))
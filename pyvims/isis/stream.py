@@ -0,0 +1,116 @@
+"""Stream VIMS data across many ISIS cubes."""
+
+import warnings
+from collections import namedtuple
+
+import numpy as np
+
+from .errors import VIMSError
+from .vims import VIMS
+
+
+Band = namedtuple('Band', 'img_id wvln img')
+Spectra = namedtuple('Spectra', 'img_id lines samples wvlns spectra')
+
+
+def _cubes(fnames, root=None):
+    """Open the cubes lazily one at the time (memory-mapped)."""
+    for fname in fnames:
+        yield VIMS(fname, root=root, mmap=True)
+
+
+def iter_bands(fnames, wvln=None, band=None, root=None):
+    """Iterate over the images at a given wavelength or band.
+
+    Only the closest band is read in each cube.
+
+    Parameters
+    ----------
+    fnames: iterable
+        VIMS cubes filenames.
+    wvln: float, optional
+        Wavelength (um). The closest band is selected.
+    band: int, optional
+        Band number (1-based). Used if no wavelength is provided.
+    root: str, optional
+        Data root folder (see :py:class:`VIMS`).
+
+    Yields
+    ------
+    Band
+        Image ID, band wavelength and ``(NL, NS)`` image.
+
+    Raises
+    ------
+    VIMSError
+        If neither a wavelength nor a band is provided.
+
+    Warns
+    -----
+    UserWarning
+        If the wavelength or the band is outside a
+        cube range. This cube is skipped.
+
+    """
+    if wvln is None and band is None:
+        raise VIMSError('A wavelength or a band is required.')
+
+    for cube in _cubes(fnames, root=root):
+        if wvln is not None:
+            index = cube.wvlns_index
+            if not (index.min <= wvln <= index.max):
+                warnings.warn(f'Wavelength `{wvln}` invalid for `{cube}` (skipped). '
+                              f'Must be between {index.min} and {index.max}')
+                continue
+            iband = index.indices(wvln)
+        else:
+            if not (1 <= band <= cube.NB):
+                warnings.warn(f'Band `{band}` invalid for `{cube}` (skipped). '
+                              f'Must be between 1 and {cube.NB}')
+                continue
+            iband = band - 1
+
+        yield Band(cube.img_id, cube.wvlns[iband], cube.isis.read(bands=iband))
+
+
+def iter_spectra(fnames, where=None, root=None):
+    """Iterate over the spectra of the selected pixels in each cube.
+
+    Only the window enclosing the selected pixels is read.
+
+    Parameters
+    ----------
+    fnames: iterable
+        VIMS cubes filenames.
+    where: callable, optional
+        Pixels selection function. Takes the :py:class:`VIMS`
+        cube and returns a ``(NL, NS)`` boolean mask.
+        All the pixels are selected if not provided.
+    root: str, optional
+        Data root folder (see :py:class:`VIMS`).
+
+    Yields
+    ------
+    Spectra
+        Image ID, selected lines and samples (1-based), wavelengths
+        and ``(N, NB)`` spectra. Cubes without selected pixel are skipped.
+
+    """
+    for cube in _cubes(fnames, root=root):
+        if where is None:
+            mask = np.ones((cube.NL, cube.NS), dtype=bool)
+        else:
+            mask = np.asarray(where(cube), dtype=bool)
+
+        if mask.shape != (cube.NL, cube.NS):
+            raise VIMSError(f'Pixels mask shape `{mask.shape}` invalid for `{cube}`. '
+                            f'Must be {(cube.NL, cube.NS)}')
+
+        lines, samples = np.nonzero(mask)
+        if len(lines) == 0:
+            continue
+
+        lines, samples = lines + 1, samples + 1
+        spectra = cube._pixels(lines, samples).T
+
+        yield Spectra(cube.img_id, lines, samples, cube.wvlns, spectra)
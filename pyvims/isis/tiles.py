@@ -0,0 +1,128 @@
+"""ISIS tiled cube module."""
+
+import numpy as np
+
+
+def untile(tiles, nl=None, ns=None):
+    """Re-arrange ISIS tiles into a band sequential cube.
+
+    Parameters
+    ----------
+    tiles: numpy.ndarray
+        Tiles data with a ``(NB, TL, TS, TileLines, TileSamples)`` shape,
+        where ``TL`` and ``TS`` are the number of tiles in the line
+        and sample directions.
+    nl: int, optional
+        Number of lines to keep (remove the tiles padding).
+    ns: int, optional
+        Number of samples to keep (remove the tiles padding).
+
+    Returns
+    -------
+    numpy.ndarray
+        Cube data with a ``(NB, NL, NS)`` shape.
+
+    """
+    nb, tl, ts, tile_lines, tile_samples = tiles.shape
+
+    cube = np.reshape(
+        np.transpose(tiles, (0, 1, 3, 2, 4)),
+        (nb, tl * tile_lines, ts * tile_samples))
+
+    return cube[:, :nl, :ns]
+
+
+def _index(key, n):
+    """Convert an axis key into an array of indexes.
+
+    Returns
+    -------
+    numpy.ndarray, bool
+        Indexes and scalar key flag.
+
+    """
+    index = np.arange(n)[key]
+
+    if np.ndim(index) == 0:
+        return np.array([index]), True
+
+    if np.ndim(index) > 1:
+        raise IndexError('Only 1D indexes are supported on tiled cubes.')
+
+    return index, False
+
+
+def _keys(key, ndim=3):
+    """Expand the key on all the axes."""
+    if not isinstance(key, tuple):
+        key = (key,)
+
+    if any(k is None for k in key):
+        raise IndexError('New axis are not supported on tiled cubes.')
+
+    if any(k is Ellipsis for k in key):
+        i = [k is Ellipsis for k in key].index(True)
+        key = key[:i] + (slice(None),) * (ndim - len(key) + 1) + key[i + 1:]
+
+    if len(key) > ndim:
+        raise IndexError(f'Too many indexes for a {ndim}D cube.')
+
+    return key + (slice(None),) * (ndim - len(key))
+
+
+class ISISTiles:
+    """ISIS tiled cube core.
+
+    Only the tiles overlapping the requested
+    slices are read from the raw data.
+
+    Parameters
+    ----------
+    tiles: numpy.memmap
+        Raw tiles data with a ``(NB, TL, TS, TileLines, TileSamples)`` shape.
+    shape: tuple
+        Cube shape ``(NB, NL, NS)``.
+
+    """
+
+    def __init__(self, tiles, shape):
+        self.tiles = tiles
+        self.shape = shape
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> Shape: {self.shape}'
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        bands, lines, samples = [
+            _index(k, n) for k, n in zip(_keys(key), self.shape)]
+
+        tile_lines, tile_samples = self.tiles.shape[3:]
+
+        tl, lines_index = np.unique(lines[0] // tile_lines, return_inverse=True)
+        ts, samples_index = np.unique(samples[0] // tile_samples, return_inverse=True)
+
+        data = untile(self.tiles[np.ix_(bands[0], tl, ts)])
+
+        data = data[np.ix_(
+            np.arange(len(bands[0])),
+            lines_index * tile_lines + lines[0] % tile_lines,
+            samples_index * tile_samples + samples[0] % tile_samples,
+        )]
+
+        return data[tuple(
+            0 if scalar else slice(None)
+            for _, scalar in (bands, lines, samples)
+        )]
+
+    @property
+    def ndim(self):
+        """Cube number of dimensions."""
+        return len(self.shape)
+
+    @property
+    def dtype(self):
+        """Raw data type."""
+        return self.tiles.dtype
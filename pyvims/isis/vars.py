@@ -18,3 +18,64 @@ FIELD_TYPES = {
     'Real': 'f4',
     'Double': 'f8',
 }
+
+# ISIS special pixels values (IEEE bits patterns for Real and Double types)
+SPECIAL_PIXELS = {
+    'UnsignedByte': {
+        'Null': 0,
+        'Hrs': 255,
+    },
+    'SignedByte': {
+        'Null': -128,
+        'Hrs': 127,
+    },
+    'UnsignedWord': {
+        'Null': 0,
+        'Lrs': 1,
+        'Lis': 2,
+        'His': 65534,
+        'Hrs': 65535,
+    },
+    'SignedWord': {
+        'Null': -32768,
+        'Lrs': -32767,
+        'Lis': -32766,
+        'His': -32765,
+        'Hrs': -32764,
+    },
+    'UnsignedInteger': {
+        'Null': 0,
+        'Lrs': 1,
+        'Lis': 2,
+        'His': 4294967294,
+        'Hrs': 4294967295,
+    },
+    'SignedInteger': {
+        'Null': -8388613,
+        'Lrs': -8388612,
+        'Lis': -8388611,
+        'His': -8388610,
+        'Hrs': -8388609,
+    },
+    'Integer': {
+        'Null': -8388613,
+        'Lrs': -8388612,
+        'Lis': -8388611,
+        'His': -8388610,
+        'Hrs': -8388609,
+    },
+    'Real': {
+        'Null': 0xFF7FFFFB,
+        'Lrs': 0xFF7FFFFC,
+        'Lis': 0xFF7FFFFD,
+        'His': 0xFF7FFFFE,
+        'Hrs': 0xFF7FFFFF,
+    },
+    'Double': {
+        'Null': 0xFFEFFFFFFFFFFFFB,
+        'Lrs': 0xFFEFFFFFFFFFFFFC,
+        'Lis': 0xFFEFFFFFFFFFFFFD,
+        'His': 0xFFEFFFFFFFFFFFFE,
+        'Hrs': 0xFFEFFFFFFFFFFFFF,
+    },
+}
@@ -7,6 +7,7 @@ import numpy as np
 
 from .errors import VIMSError
 from .isis import ISISCube
+from ..spectral import spectral_index
 
 
 def get_img_id(fname):
@@ -33,12 +34,15 @@ class VIMS:
         first or the local directory otherwise.
         You can manually force the local directory
         with ``root='.'``.
+    mmap: bool, optional
+        Memory-map the cube data (see :py:class:`ISISCube`).
 
     """
 
-    def __init__(self, fname, root=None):
+    def __init__(self, fname, root=None, mmap=False):
         self.img_id = fname
         self.root = root
+        self.mmap = mmap
         self.fname = fname
 
     def __str__(self):
@@ -48,20 +52,20 @@ class VIMS:
         return f'<{self.__class__.__name__}> Cube: {self}'
 
     def __matmul__(self, other):
-        if isinstance(other, int):
+        if isinstance(other, (int, np.integer)):
             if not (1 <= other <= self.NB):
                 raise VIMSError(f'Band `{other}` invalid. Must be between 1 and {self.NB}')
 
             return self.data[other-1, :, :]
 
-        if isinstance(other, float):
-            if not (self.wvlns[0] <= other <= self.wvlns[-1]):
+        if isinstance(other, (float, np.floating)):
+            index = self.wvlns_index
+            if not (index.min <= other <= index.max):
                 raise VIMSError(f'Wavelength `{other}` invalid. Must be '
-                                f'between {self.wvlns[0]} and {self.wvlns[-1]}')
+                                f'between {index.min} and {index.max}')
 
             # No interpolation. Take the closest wavelength.
-            iwvln = np.argmin(np.abs(self.wvlns - other))
-            return self.data[iwvln, :, :]
+            return self.data[index.indices(other), :, :]
 
         if isinstance(other, tuple):
             if len(other) != 2:
@@ -77,13 +81,84 @@ class VIMS:
 
             return self.data[:, int(L) - 1, int(S) - 1]
 
+        if isinstance(other, (list, np.ndarray)):
+            values = np.asarray(other)
+
+            if values.dtype == bool:
+                if values.shape == (self.NB,):
+                    return self._bands(np.flatnonzero(values) + 1)
+
+                if values.shape == (self.NL, self.NS):
+                    lines, samples = np.nonzero(values)
+                    return self._pixels(lines + 1, samples + 1)
+
+                raise VIMSError(f'Mask shape `{values.shape}` invalid. Must be '
+                                f'({self.NB},) or ({self.NL}, {self.NS})')
+
+            if values.ndim == 2 and values.shape[1] == 2 \
+                    and np.issubdtype(values.dtype, np.integer):
+                return self._pixels(values[:, 0], values[:, 1])
+
+            if values.ndim == 1 and np.issubdtype(values.dtype, np.integer):
+                return self._bands(values)
+
+            if values.ndim == 1 and np.issubdtype(values.dtype, np.floating):
+                return self._wvlns(values)
+
         raise VIMSError('\n - '.join([
             f'Invalid format. Use:',
             'INT -> band',
             'FLOAT -> wavelength',
             '(INT, INT) -> Line, Sample',
+            '[INT, ...] -> bands',
+            '[FLOAT, ...] -> wavelengths',
+            '[(INT, INT), ...] -> Lines, Samples',
+            'BOOL[NB] -> bands mask',
+            'BOOL[NL, NS] -> pixels mask',
         ]))
 
+    def _bands(self, bands):
+        """Images at multiple bands (1-based)."""
+        if np.any((bands < 1) | (bands > self.NB)):
+            raise VIMSError(f'Bands `{bands[(bands < 1) | (bands > self.NB)]}` '
+                            f'invalid. Must be between 1 and {self.NB}')
+
+        return self.isis.read(bands=bands - 1)
+
+    def _wvlns(self, wvlns):
+        """Images at multiple wavelengths (closest bands)."""
+        index = self.wvlns_index
+        invalid = (wvlns < index.min) | (wvlns > index.max)
+        if np.any(invalid):
+            raise VIMSError(f'Wavelengths `{wvlns[invalid]}` invalid. Must be '
+                            f'between {index.min} and {index.max}')
+
+        # No interpolation. Take the closest wavelengths.
+        return self.isis.read(bands=index.indices(wvlns))
+
+    def _pixels(self, lines, samples):
+        """Spectra at multiple pixels (1-based).
+
+        Only the window enclosing all the pixels is read.
+
+        """
+        if np.any((lines < 1) | (lines > self.NL)):
+            raise VIMSError(f'Lines `{lines[(lines < 1) | (lines > self.NL)]}` '
+                            f'invalid. Must be between 1 and {self.NL}')
+
+        if np.any((samples < 1) | (samples > self.NS)):
+            raise VIMSError(f'Samples `{samples[(samples < 1) | (samples > self.NS)]}` '
+                            f'invalid. Must be between 1 and {self.NS}')
+
+        if len(lines) == 0:
+            return np.empty((self.NB, 0))
+
+        l0, s0 = np.min(lines), np.min(samples)
+        window = self.isis.read(lines=slice(l0 - 1, np.max(lines)),
+                                samples=slice(s0 - 1, np.max(samples)))
+
+        return window[:, lines - l0, samples - s0]
+
     @property
     def img_id(self):
         """Cube image ID."""
@@ -120,6 +195,7 @@ class VIMS:
     def fname(self, fname):
         self.__fname = fname
         self.__isis = None
+        self.__wvlns_index = None
 
     @property
     def filename(self):
@@ -130,7 +206,7 @@ class VIMS:
     def isis(self):
         """ISIS cube."""
         if self.__isis is None:
-            self.__isis = ISISCube(self.filename)
+            self.__isis = ISISCube(self.filename, mmap=self.mmap)
         return self.__isis
 
     @property
@@ -178,6 +254,13 @@ class VIMS:
         """Cube central wavelengths (um) shortcut."""
         return self.wvlns
 
+    @property
+    def wvlns_index(self):
+        """Cube sorted wavelengths index."""
+        if self.__wvlns_index is None:
+            self.__wvlns_index = spectral_index(self.wvlns)
+        return self.__wvlns_index
+
     @property
     def extent(self):
         """Cube images extent."""
@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+"""PDS qube reader module.
+
+The qube is mapped in memory with nested structured dtypes
+(core items followed by the suffix items on each axis) such
+that the core is exposed as a strided view without any copy.
+
+"""
+
+import re
+
+import numpy as np
+
+from .isis.errors import ISISError
+from .isis.header import MAX_LABEL, read_label_bytes
+
+
+# PDS label end record (followed by the data)
+LABEL_END = re.compile(rb'^(?:END|FIN)[ \t]*\r?\n', re.MULTILINE)
+
+# PDS label `KEY = VALUE` statements
+KEYS = re.compile(r'^[ \t]*([\^A-Z0-9_:]+)[ \t]*=[ \t]*(.*?)[ \t]*\r?$', re.MULTILINE)
+
+# PDS item types with most significant byte first
+MSB = ('SUN_', 'MSB_', 'MAC_', 'IEEE_')
+
+# Cube axes order
+AXES = ('BAND', 'LINE', 'SAMPLE')
+
+
+def read_label(filename, chunk=65536, maxsize=MAX_LABEL):
+    """Read only the PDS label bytes of a file.
+
+    The file is read in binary mode by chunks until
+    the ``END`` record is found (see :py:func:`read_label_bytes`).
+
+    Parameters
+    ----------
+    filename: str
+        PDS filename.
+    chunk: int, optional
+        Chunk size (bytes).
+    maxsize: int, optional
+        Maximum label size (bytes).
+
+    Returns
+    -------
+    str, int
+        PDS label content and the exact byte
+        offset after the ``END`` record.
+
+    Raises
+    ------
+    ValueError
+        If the ``END`` record is not found in the first ``maxsize`` bytes.
+
+    """
+    try:
+        data = read_label_bytes(filename, chunk=chunk, end=LABEL_END, maxsize=maxsize)
+    except ISISError as err:
+        raise ValueError(f'PDS label `END` record not found: {err}') from None
+
+    return data.decode('latin-1'), len(data)
+
+
+def parse_keys(label):
+    """Parse PDS label statements (single regex pass).
+
+    Parameters
+    ----------
+    label: str
+        PDS label content.
+
+    Returns
+    -------
+    dict
+        Raw values (``str``) of the first occurrence of each key.
+        The multi-lines values are not supported.
+
+    """
+    keys = {}
+    for key, value in KEYS.findall(label):
+        keys.setdefault(key, value)
+    return keys
+
+
+def split_values(value):
+    """Split a PDS raw value list ``(A,"B",C)`` into strings."""
+    return [item.strip().strip('"') for item in value.strip('()').split(',')]
+
+
+def item_dtype(item_type, item_bytes):
+    """Numpy dtype of a PDS qube item.
+
+    Parameters
+    ----------
+    item_type: str
+        PDS item type (``SUN_INTEGER``, ``PC_REAL``, ``IEEE_REAL``, ...).
+        Types without an explicit byte order are read as
+        little endian.
+    item_bytes: int
+        Item size (bytes).
+
+    Returns
+    -------
+    numpy.dtype
+        Item data type.
+
+    """
+    item_type = str(item_type).upper()
+    order = '>' if item_type.startswith(MSB) else '<'
+
+    if 'REAL' in item_type or 'FLOAT' in item_type:
+        kind = 'f'
+    elif 'UNSIGNED' in item_type:
+        kind = 'u'
+    else:
+        kind = 'i'
+
+    return np.dtype(f'{order}{kind}{int(item_bytes)}')
+
+
+def _per_item(value, n):
+    """Suffix key value for each of the ``n`` items."""
+    if isinstance(value, (list, tuple)):
+        return [value[min(i, len(value) - 1)] for i in range(n)]
+    return [value] * n
+
+
+def start_byte(label, pointer='^QUBE'):
+    """Data start byte from a PDS pointer.
+
+    Parameters
+    ----------
+    label: dict
+        PDS label.
+    pointer: str, optional
+        Pointer name.
+
+    Returns
+    -------
+    int
+        Zero-based start byte.
+
+    """
+    ptr = label[pointer]
+
+    if hasattr(ptr, 'units'):
+        if str(ptr.units).upper() == 'BYTES':
+            return int(ptr.value) - 1
+        ptr = ptr.value
+
+    elif isinstance(ptr, (list, tuple)):
+        return start_byte({pointer: ptr[-1],
+                           'RECORD_BYTES': label['RECORD_BYTES']}, pointer)
+
+    return (int(ptr) - 1) * int(label['RECORD_BYTES'])
+
+
+class PDSQube:
+    """PDS qube data reader.
+
+    Parameters
+    ----------
+    filename: str
+        Qube filename.
+    qube: dict
+        ``QUBE`` object label.
+    offset: int, optional
+        Qube start byte in the file.
+
+    Note
+    ----
+    The first axis in ``AXIS_NAME`` is the fastest varying axis.
+    Each core line is followed by its sideplane items, each core
+    plane by its bottomplane lines and the core by the backplanes.
+    Each suffix item is stored in a ``SUFFIX_BYTES`` slot. The
+    suffix items types and sizes are provided on each axis (eg.
+    ``BAND_SUFFIX_ITEM_TYPE``) or globally (``SUFFIX_ITEM_TYPE``).
+    The corner items use the first axis suffix types.
+
+    """
+
+    def __init__(self, filename, qube, offset=0):
+        self.filename = filename
+        self.qube = qube
+        self.offset = offset
+        self.__mmap = None
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__}> Axes: {self.axes} | '
+                f'Core: {self.core_items} | Suffix: {self.suffix_items}')
+
+    @property
+    def axes(self):
+        """Qube axes names (fastest first)."""
+        return tuple(self.qube['AXIS_NAME'])
+
+    @property
+    def core_items(self):
+        """Core items on each axis."""
+        return tuple(int(n) for n in self.qube['CORE_ITEMS'])
+
+    @property
+    def suffix_items(self):
+        """Suffix items on each axis."""
+        return tuple(int(n) for n in self.qube.get('SUFFIX_ITEMS', (0, 0, 0)))
+
+    @property
+    def core_dtype(self):
+        """Core items data type."""
+        return item_dtype(self.qube['CORE_ITEM_TYPE'],
+                          self.qube['CORE_ITEM_BYTES'])
+
+    @property
+    def suffix_bytes(self):
+        """Suffix items slot size (bytes)."""
+        return int(self.qube.get('SUFFIX_BYTES', 4))
+
+    def suffix_dtypes(self, axis):
+        """Suffix items data types along an axis.
+
+        The ``<AXIS>_SUFFIX_ITEM_TYPE`` and ``<AXIS>_SUFFIX_ITEM_BYTES``
+        keys (a single value or one value per item) take precedence
+        over ``SUFFIX_ITEM_TYPE``. The items fill their ``SUFFIX_BYTES``
+        slots if no item size is provided and are read as integers
+        with the core byte order if no item type is provided.
+
+        """
+        n = self.suffix_items[self.axes.index(axis)]
+        types = _per_item(self.qube.get(f'{axis}_SUFFIX_ITEM_TYPE',
+                                        self.qube.get('SUFFIX_ITEM_TYPE')), n)
+        sizes = _per_item(self.qube.get(f'{axis}_SUFFIX_ITEM_BYTES',
+                                        self.suffix_bytes), n)
+
+        return [item_dtype(item_type, item_bytes) if item_type is not None
+                else np.dtype(f'i{int(item_bytes)}').newbyteorder(self.core_dtype.byteorder)
+                for item_type, item_bytes in zip(types, sizes)]
+
+    def _slot(self, dtype):
+        """Suffix item slot structure (``SUFFIX_BYTES`` wide).
+
+        The item is read as the low order bytes of the
+        slot: at the end of the slot with the most significant
+        byte first and at the beginning otherwise.
+
+        """
+        shift = self.suffix_bytes - dtype.itemsize if dtype.str[0] == '>' else 0
+        return np.dtype({'names': ['item'], 'formats': [dtype],
+                         'offsets': [shift], 'itemsize': self.suffix_bytes})
+
+    def _slots(self, axis):
+        """Suffix items slots along an axis (one field per item)."""
+        return np.dtype([(str(i), self._slot(dtype))
+                         for i, dtype in enumerate(self.suffix_dtypes(axis))])
+
+    def _line(self, dtype):
+        """Line structure (core items and sideplane items)."""
+        return np.dtype([
+            ('core', dtype, (self.core_items[0],)),
+            ('suffix', self._slots(self.axes[0])),
+        ])
+
+    @property
+    def plane(self):
+        """Plane structured dtype (core lines and bottomplane lines)."""
+        return np.dtype([
+            ('core', self._line(self.core_dtype), (self.core_items[1],)),
+            ('suffix', [(str(i), self._line(self._slot(dtype)))
+                        for i, dtype in enumerate(self.suffix_dtypes(self.axes[1]))]),
+        ])
+
+    @property
+    def backplane(self):
+        """Backplanes structured dtype (one field per suffix item)."""
+        planes = []
+        for i, dtype in enumerate(self.suffix_dtypes(self.axes[2])):
+            line = self._line(self._slot(dtype))
+            planes.append((str(i), [
+                ('core', line, (self.core_items[1],)),
+                ('suffix', line, (self.suffix_items[1],)),
+            ]))
+        return np.dtype(planes)
+
+    @property
+    def nbytes(self):
+        """Qube size (bytes)."""
+        return self.core_items[2] * self.plane.itemsize + self.backplane.itemsize
+
+    @property
+    def mmap(self):
+        """Memory map of the whole qube (bytes)."""
+        if self.__mmap is None:
+            self.__mmap = np.memmap(self.filename, dtype=np.uint8, mode='r',
+                                    offset=self.offset, shape=(self.nbytes,))
+        return self.__mmap
+
+    @property
+    def planes(self):
+        """Core planes (with their sideplanes and bottomplanes)."""
+        return self.mmap[:self.core_items[2] * self.plane.itemsize].view(self.plane)
+
+    @property
+    def backplanes(self):
+        """Backplanes (after the core planes)."""
+        return self.mmap[self.core_items[2] * self.plane.itemsize:].view(self.backplane)
+
+    def transpose(self, data):
+        """Transpose qube ordered data into ``(NB, NL, NS)``."""
+        axes = self.axes[::-1]
+        return data.transpose([axes.index(axis) for axis in AXES])
+
+    @property
+    def core(self):
+        """Core data view ``(NB, NL, NS)`` (no copy)."""
+        return self.transpose(self.planes['core']['core'])
+
+    def suffix_planes(self, axis):
+        """Suffix items planes along an axis in qube order (no copy).
+
+        Parameters
+        ----------
+        axis: str
+            Suffix axis name (``SAMPLE``, ``LINE`` or ``BAND``).
+
+        Returns
+        -------
+        list
+            Suffix items planes with the remaining
+            axes in reversed ``AXIS_NAME`` order.
+
+        """
+        i = self.axes.index(axis)
+        items = [str(j) for j in range(self.suffix_items[i])]
+
+        if i == 0:
+            suffix = self.planes['core']['suffix']
+            return [suffix[item]['item'] for item in items]
+
+        if i == 1:
+            suffix = self.planes['suffix']
+            return [suffix[item]['core']['item'] for item in items]
+
+        return [self.backplanes[item]['core']['core']['item'][0] for item in items]
+
+    def suffix_names(self, axis):
+        """Suffix names along an axis.
+
+        Provided by ``<AXIS>_SUFFIX_NAME`` or
+        set to ``<AXIS>_SUFFIX_<N>`` otherwise.
+
+        """
+        n = self.suffix_items[self.axes.index(axis)]
+        names = self.qube.get(f'{axis}_SUFFIX_NAME', [])
+
+        if isinstance(names, str):
+            names = [names]
+
+        return [str(names[i]) if i < len(names) else f'{axis}_SUFFIX_{i + 1}'
+                for i in range(n)]
+
+    @property
+    def suffix(self):
+        """Named suffix planes views (no copy).
+
+        Each plane is indexed on the remaining axes
+        in ``(BAND, LINE, SAMPLE)`` order (eg. ``(NL, NS)``
+        for a ``BAND`` suffix).
+
+        """
+        planes = {}
+        qube_axes = self.axes[::-1]
+
+        for axis in self.axes:
+            others = [a for a in qube_axes if a != axis]
+            order = [others.index(a) for a in AXES if a != axis]
+
+            for name, plane in zip(self.suffix_names(axis), self.suffix_planes(axis)):
+                planes[name] = plane.transpose(order)
+
+        return planes
+
+    def read(self, dtype=float):
+        """Read the core data.
+
+        Parameters
+        ----------
+        dtype: numpy.dtype, optional
+            Output data type. If ``None``, the native type is kept.
+
+        Returns
+        -------
+        numpy.ndarray
+            Core data ``(NB, NL, NS)``.
+
+        """
+        return np.array(self.core, dtype=dtype)
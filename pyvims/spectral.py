@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Spectral index module."""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+class SpectralIndex:
+    """Sorted spectral index for nearest bands/wavelengths lookup.
+
+    Parameters
+    ----------
+    values: numpy.ndarray
+        Bands or wavelengths values. ``NaN`` values
+        (eg. missing VIS or IR channel) are ignored.
+
+    """
+
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=float)
+
+        valid = np.flatnonzero(~np.isnan(self.values))
+        order = np.argsort(self.values[valid], kind='stable')
+
+        self._index = valid[order]
+        self._sorted = self.values[self._index]
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__}> '
+                f'{len(self)} values between {self.min} and {self.max}')
+
+    def __len__(self):
+        return len(self._sorted)
+
+    @property
+    def min(self):
+        """Minimum value."""
+        return self._sorted[0] if len(self) else np.nan
+
+    @property
+    def max(self):
+        """Maximum value."""
+        return self._sorted[-1] if len(self) else np.nan
+
+    def indices(self, values):
+        """Indexes of the nearest values.
+
+        Parameters
+        ----------
+        values: float or numpy.ndarray
+            Values to look for.
+
+        Returns
+        -------
+        int or numpy.ndarray
+            Nearest values indexes in the original (unsorted) values.
+            In case of equal distances the smallest index is selected.
+
+        """
+        if not len(self):
+            raise ValueError('Spectral index is empty.')
+
+        values = np.asarray(values, dtype=float)
+
+        right = np.searchsorted(self._sorted, values).clip(1, max(len(self) - 1, 1))
+        left = right - 1
+
+        if len(self) == 1:
+            return self._index[np.zeros_like(right)][()]
+
+        dl = np.abs(values - self._sorted[left])
+        dr = np.abs(self._sorted[right] - values)
+
+        # First occurrence of the left value (stable sort on duplicates)
+        left = np.searchsorted(self._sorted, self._sorted[left])
+        ileft, iright = self._index[left], self._index[right]
+
+        indices = np.where(dl < dr, ileft,
+                           np.where(dl > dr, iright, np.minimum(ileft, iright)))
+
+        return indices[()] if indices.ndim == 0 else indices
+
+
+@lru_cache(maxsize=64)
+def _spectral_index(key):
+    """Cached spectral index from values bytes."""
+    return SpectralIndex(np.frombuffer(key))
+
+
+def spectral_index(values):
+    """Get a cached spectral index.
+
+    The indexes are shared between the cubes with
+    the same values (eg. the standard VIMS bands table).
+
+    Parameters
+    ----------
+    values: numpy.ndarray
+        Bands or wavelengths values.
+
+    Returns
+    -------
+    SpectralIndex
+        Spectral index.
+
+    """
+    return _spectral_index(np.asarray(values, dtype=float).tobytes())
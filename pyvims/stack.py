@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""Virtual stacked cube module."""
+
+import numpy as np
+
+
+def nan_channel(shape):
+    """Missing channel constant ``NaN`` view (no memory allocated)."""
+    return np.broadcast_to(np.float64(np.nan), shape)
+
+
+class StackedCube:
+    """Virtual cube stacked along the bands axis.
+
+    The channels (arrays, memmaps or lazy ISIS cores)
+    are only indexed on demand, and the stacked cube is
+    materialized only when converted into an array.
+
+    Parameters
+    ----------
+    *channels: numpy.ndarray or ISISCore
+        Channels data ``(NB_i, NL, NS)`` (eg. VIS and IR).
+
+    Note
+    ----
+    The bands axis accepts ``int``, ``slice`` and
+    arrays of indexes. The lines and samples axes
+    are indexed independently on each channel.
+
+    """
+
+    def __init__(self, *channels):
+        shapes = {tuple(channel.shape[1:]) for channel in channels}
+        if len(shapes) != 1:
+            raise ValueError(f'Channels spatial shapes mismatch: {shapes}')
+
+        self.channels = channels
+        self.offsets = np.cumsum([0] + [channel.shape[0] for channel in channels])
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}> Shape: {self.shape}'
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None):
+        data = self[...]
+        return data if dtype is None else data.astype(dtype)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if key and key[0] is not Ellipsis:
+            bands, others = key[0], key[1:]
+        else:
+            bands, others = slice(None), key
+
+        if isinstance(bands, (int, np.integer)):
+            band = int(np.arange(len(self))[bands])
+            i = np.searchsorted(self.offsets, band, side='right') - 1
+            return np.asarray(self.channels[i][(band - self.offsets[i],) + others])
+
+        return self._bands(np.arange(len(self))[bands], others)
+
+    def _bands(self, bands, others):
+        """Read multiple bands from each channel."""
+        out = None
+        for i, channel in enumerate(self.channels):
+            start, stop = self.offsets[i], self.offsets[i + 1]
+            select = (bands >= start) & (bands < stop)
+
+            if not select.any():
+                continue
+
+            local = bands[select] - start
+
+            # Contiguous bands are read as a slice
+            if np.all(np.diff(local) == 1):
+                local = slice(local[0], local[-1] + 1)
+
+            data = np.asarray(channel[(local,) + others])
+
+            if out is None:
+                out = np.empty((len(bands),) + data.shape[1:],
+                               dtype=np.result_type(data.dtype, np.float64))
+            out[select] = data
+
+        if out is None:
+            data = np.asarray(self.channels[0][(slice(0, 0),) + others])
+            out = np.empty((0,) + data.shape[1:])
+
+        return out
+
+    @property
+    def shape(self):
+        """Stacked cube shape."""
+        return (int(self.offsets[-1]),) + tuple(self.channels[0].shape[1:])
+
+    @property
+    def ndim(self):
+        """Stacked cube number of dimensions."""
+        return len(self.shape)
+
+    @property
+    def size(self):
+        """Stacked cube number of values."""
+        return int(np.prod(self.shape))
+
+    @property
+    def dtype(self):
+        """Stacked cube data type."""
+        return np.dtype(np.float64)
@@ -1,38 +1,84 @@
 # -*- coding: utf-8 -*-
 import sys, os
+from collections import OrderedDict
 import numpy as np
 from datetime import datetime as dt
 import pvl
 from planetaryimage import CubeFile
 
+from ._communs import getImgID
 from .vims_geotiff import VIMS_GEOTIFF
 from .vims_team  import VIMS_TEAM
 from .vims_isis3 import VIMS_ISIS3
 from .vims_qub   import VIMS_QUB
 from .vims_lbl   import VIMS_LBL
 
+# VIMS formats filenames patterns and catalog products (by priority)
+FORMATS = (
+    (VIMS_GEOTIFF, ('{}.tif',),                  ('GEOTIFF',)),
+    (VIMS_TEAM,    ('CM_{}.cub',),               ('TEAM',)),
+    (VIMS_ISIS3,   ('C{}_ir.cub', 'C{}_vis.cub'), ('CLN_IR', 'CLN_VIS')),
+    (VIMS_QUB,     ('v{}.qub',),                 ('QUB',)),
+    (VIMS_LBL,     ('v{}.lbl',),                 ('LBL',)),
+)
+
+# Most recently used folders listings
+_LISTINGS = OrderedDict()
+MAX_LISTINGS = 8
+
+def listdir(root=''):
+    '''Cached root folder listing (refreshed when the folder mtime changes)
+
+    Only the `MAX_LISTINGS` most recently used folders are kept.
+    '''
+    folder = os.path.dirname(root) or '.'
+    try:
+        mtime = os.stat(folder).st_mtime_ns
+    except OSError:
+        return frozenset()
+
+    cached = _LISTINGS.get(folder)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, frozenset(os.listdir(folder)))
+        _LISTINGS[folder] = cached
+
+    _LISTINGS.move_to_end(folder)
+    while len(_LISTINGS) > MAX_LISTINGS:
+        _LISTINGS.popitem(last=False)
+
+    return cached[1]
+
+def getFormat(imgID, root='', index=None):
+    '''Get the VIMS class and root of the first available format
+
+    index:
+        Products files index (`pyvims.catalog.FileIndex`)
+        used instead of the root folder listing
+    '''
+    img_id = getImgID(imgID)
+
+    if index is not None:
+        products = index.products(img_id)
+        for vims_cls, _, names in FORMATS:
+            for name in names:
+                if name in products:
+                    return vims_cls, os.path.join(os.path.dirname(products[name][0]), '')
+    else:
+        files = listdir(root)
+        prefix = os.path.basename(root)
+        for vims_cls, patterns, _ in FORMATS:
+            if any(prefix + pattern.format(img_id) in files for pattern in patterns):
+                return vims_cls, root
+
+    raise NameError('GeoTiff/CUB/QUB/LBL: %s not found' % imgID)
+
 class VIMS(object):
-    '''Polymorphic VIMS class based on input file'''
-    def __new__(cls, imgID, root=''):
-        try:
-            inst = VIMS_GEOTIFF.__new__(VIMS_GEOTIFF)
-            inst.__init__(imgID, root)
-        except NameError:
-            try:
-                inst = VIMS_TEAM.__new__(VIMS_TEAM)
-                inst.__init__(imgID, root)
-            except NameError:
-                try:
-                    inst = VIMS_ISIS3.__new__(VIMS_ISIS3)
-                    inst.__init__(imgID, root)
-                except NameError:
-                    try:
-                        inst = VIMS_QUB.__new__(VIMS_QUB)
-                        inst.__init__(imgID, root)
-                    except NameError:
-                        try:
-                            inst = VIMS_LBL.__new__(VIMS_LBL)
-                            inst.__init__(imgID, root)
-                        except NameError:
-                            raise NameError('GeoTiff/CUB/QUB/LBL: %s not found' % imgID )
-        return inst
+    '''Polymorphic VIMS class based on input file
+
+    The format is selected from the root folder listing
+    (cached until the folder is modified) or from a products
+    files index and only the corresponding class is instantiated.
+    '''
+    def __new__(cls, imgID, root='', index=None):
+        vims_cls, root = getFormat(imgID, root, index)
+        return vims_cls(imgID, root)
@@ -4,9 +4,9 @@ import numpy as np
 import cv2
 import piexif
 import pvl
-import scipy.interpolate
 
 from ._communs import getImgID, imgClip, imgInterp
+from .spectral import spectral_index
 from .plot import img_cube as plot_img_cube
 from .plot import spectrum_cube as plot_spectrum_cube
 from .map import map_cube as plot_map_cube
@@ -15,12 +15,38 @@ from .vims_nav import VIMS_NAV
 from .vims_nav_isis3 import VIMS_NAV_ISIS3
 from .spice_moon import SPICE_MOON
 from .geotiff import GeoTiff, ENVI, ArcMap
-from .geotiff.ortho import grid as ortho_grid
+from .geotiff.operators import OPERATORS
 from .geotiff.ortho import srs as ortho_srs
 
 
+def navProperty(name):
+    '''Lazy navigation property (loaded with `setNAV` on first access)'''
+    def getter(self):
+        if not self._navLoaded:
+            self.setNAV()
+        try:
+            return self._nav[name]
+        except KeyError:
+            raise AttributeError('Navigation `%s` not available for %s' % (name, self.imgID))
+
+    def setter(self, value):
+        if self._nav is None:
+            self._nav = {}
+        self._nav[name] = value
+
+    return property(getter, setter, doc='Navigation `%s` (lazy loaded)' % name)
+
+
 class VIMS_OBJ(object):
-    '''VIMS object abstract class'''
+    '''VIMS object abstract class
+
+    The cube data and the navigation planes are loaded
+    on first access and can be released with `unload()`.
+    '''
+    _cube = None
+    _nav = None
+    _navLoaded = False
+
     def __init__(self,imgID, root=''):
         self.imgID = getImgID(imgID)
         self.root  = root
@@ -49,7 +75,40 @@ class VIMS_OBJ(object):
         '''Read VIMS CUB data file'''
         raise NotImplementedError("Subclass must implement abstract method")
 
+    @property
+    def cube(self):
+        '''VIMS cube data (loaded on first access)'''
+        if self._cube is None:
+            self.readCUB()
+        return self._cube
+
+    @cube.setter
+    def cube(self, cube):
+        self._cube = cube
+
+    lon = navProperty('lon')
+    lat = navProperty('lat')
+    inc = navProperty('inc')
+    eme = navProperty('eme')
+    phase = navProperty('phase')
+    res = navProperty('res')
+    limb = navProperty('limb')
+
+    def unload(self):
+        '''Release the cube data and the navigation planes (reloaded on next access)'''
+        self._cube = None
+        self._nav = None
+        self._navLoaded = False
+        return
+
     def setNAV(self):
+        '''Load the navigation planes
+
+        The planes already set (before loading) are kept.
+        '''
+        nav_set = self._nav or {}
+        self._nav = {}
+        self._navLoaded = True
         try:
             nav = VIMS_NAV(self.imgID, self.root)
         except NameError:
@@ -66,23 +125,34 @@ class VIMS_OBJ(object):
         self.phase = nav.phase
         self.res = nav.res
         self.limb = nav.nan
+        self._nav.update(nav_set)
         return
 
     def getBandIndex(self, band):
-        '''Get band index'''
-        if band < np.nanmin(self.bands):
-            raise ValueError('Band too small (Min = %i)' % np.nanmin(self.bands))
-        if band > np.nanmax(self.bands):
-            raise ValueError('Band too large (Max = %i)' % np.nanmax(self.bands))
-        return np.nanargmin(np.abs(self.bands-band))
+        '''Get band index (scalar or array)'''
+        index = self.getSpectralIndex('bands')
+        if np.any(np.asarray(band) < index.min):
+            raise ValueError('Band too small (Min = %i)' % index.min)
+        if np.any(np.asarray(band) > index.max):
+            raise ValueError('Band too large (Max = %i)' % index.max)
+        return index.indices(band)
 
     def getWvlnIndex(self, wvln):
-        '''Get neareast wavelength index'''
-        if wvln < np.nanmin(self.wvlns):
-            raise ValueError('Wavelength too small (Min = %.3f um)' % np.nanmin(self.wvlns))
-        if wvln > np.nanmax(self.wvlns):
-            raise ValueError('Wavelength too large (Max = %.3f um)' % np.nanmax(self.wvlns))
-        return np.nanargmin(np.abs(self.wvlns-wvln))
+        '''Get neareast wavelength index (scalar or array)'''
+        index = self.getSpectralIndex('wvlns')
+        if np.any(np.asarray(wvln) < index.min):
+            raise ValueError('Wavelength too small (Min = %.3f um)' % index.min)
+        if np.any(np.asarray(wvln) > index.max):
+            raise ValueError('Wavelength too large (Max = %.3f um)' % index.max)
+        return index.indices(wvln)
+
+    def getSpectralIndex(self, attr):
+        '''Get sorted `bands` or `wvlns` index (cached until the values change)'''
+        values = getattr(self, attr)
+        cache = self.__dict__.setdefault('_spectral_index', {})
+        if attr not in cache or cache[attr][0] is not values:
+            cache[attr] = (values, spectral_index(values))
+        return cache[attr][1]
 
     def getIndex(self, band=167, wvln=None):
         '''Get band or wavelength index'''
@@ -214,7 +284,7 @@ class VIMS_OBJ(object):
         """Line ticks."""
         return self._ticks(self.NL)
 
-    def createGeoTiff(self, noDataValue=-1, lon_0=None, lat_0=None, interp='cubic', npt=None):
+    def createGeoTiff(self, noDataValue=-1, lon_0=None, lat_0=None, interp='cubic', npt=None, workers=1):
         '''Create GeoTiff from Image infos
 
         Parameters
@@ -226,9 +296,16 @@ class VIMS_OBJ(object):
         lat_0: float, optional
             Orthographic central latitude. Default to sub-spacecraft latitude.
         interp: str, optional
-            Interpolation method (see ``scipy.interpolate.griddata`` methods).
+            Interpolation method (``nearest``, ``linear`` or ``cubic``).
         npt: int, optional
             Number of pixels in the projected cube.
+        workers: int, optional
+            Number of threads used to interpolate the bands.
+
+        Note
+        ----
+        The reprojection operators are cached and reused for
+        cubes with the same navigation (see `geotiff.operators`).
 
         '''
 
@@ -245,6 +322,7 @@ class VIMS_OBJ(object):
             'wvln#units': 'um',
             'ISIS_CUBE_HEADER': pvl.dumps(self.lbl),
             'VIMS_SAMPLING_VIS_IR': self.mode['VIS'] + ',' + self.mode['IR'],
+            'VIMS_WVLNS': ','.join(str(w) for w in self.wvlns),
         }
 
         moon = SPICE_MOON(self.target)
@@ -254,27 +332,20 @@ class VIMS_OBJ(object):
         if lon_0 is None:
             lon_0 = SC_lon
         if lat_0 is None:
-            lat_0 = S_lat
+            lat_0 = SC_lat
 
         srs = ortho_srs(lat_0, lon_0, R, self.target)
 
-        lon = self.lon[~self.limb]
-        lat = self.lat[~self.limb]
-
         if npt is None:
             npt = max([self.NS, self.NL])
 
-        x, y, X, Y, geotransform = ortho_grid(lat, lon, lat_0, lon_0, R, npt)
-
-        bands = np.nan * np.empty((self.NB, npt, npt))
-        metadataBands = []
-        for i in range(self.NB):
-            img = self.cube[i, :, :][~self.limb]
-            interp = scipy.interpolate.griddata((x, y), img, (X, Y), method=interp)
-            interp[np.isnan(interp)] = noDataValue
-            bands[i, :, :] = interp
+        # Reprojection operator shared by all the bands (and cached)
+        interpolator, geotransform = OPERATORS.get(self.lon, self.lat, self.limb,
+                                                   lat_0, lon_0, R, npt, method=interp)
+        bands = interpolator(np.asarray(self.cube)[:, ~self.limb], workers=workers)
+        bands[np.isnan(bands)] = noDataValue
 
-            metadataBands.append({'GTIFF_DIM_wvln': self.wvlns[i]})
+        metadataBands = [{'GTIFF_DIM_wvln': wvln} for wvln in self.wvlns]
 
         geotiff = GeoTiff(os.path.join(self.root, self.imgID), read=False)
         geotiff.create(npt, npt, self.NB, geotransform, metadata,
@@ -12,7 +12,6 @@ class VIMS_GEOTIFF(VIMS_OBJ):
         VIMS_OBJ.__init__(self, imgID, root)
         self.geotiff = GeoTiff(self.fname)
         self.readLBL()
-        self.readCUB()
         return
 
     def __repr__(self):
@@ -51,16 +50,11 @@ class VIMS_GEOTIFF(VIMS_OBJ):
         self.year_d = self.year + (self.doy-1)/365. # Decimal year [ISSUE: doest not apply take into account bissextile years]
         self.date   = self.dtime.strftime('%Y/%m/%d')
 
-        self.bands = np.nan * np.empty((self.NB))
-        self.wvlns = np.nan * np.empty((self.NB))
-        for i in range(self.NB):
-            self.bands[i] = i+1
-            self.wvlns[i] = float(self.geotiff.metadataBand(i+1)['GTIFF_DIM_wvln'])
+        self.wvlns = self.geotiff.wvlns
+        self.bands = np.arange(1, self.NB + 1, dtype=float)
         return
 
     def readCUB(self):
         '''Read VIMS CUB data file'''
-        self.cube = np.nan * np.empty((self.NB, self.NL, self.NS))
-        for i in range(self.NB):
-            self.cube[i, :, :] = self.geotiff.band(i+1)
+        self.cube = self.geotiff.read_all()
         return
@@ -2,9 +2,10 @@
 import sys, os
 import numpy as np
 from datetime import datetime as dt
-import pvl
-from planetaryimage import CubeFile
 
+from .cache import load_cached
+from .isis.isis import ISISCube
+from .stack import StackedCube, nan_channel
 from .vims_class import VIMS_OBJ
 
 
@@ -28,8 +29,6 @@ class VIMS_ISIS3(VIMS_OBJ):
     def __init__(self, imgID, root=''):
         VIMS_OBJ.__init__(self, imgID, root)
         self.readLBL()
-        self.readCUB()
-        self.setNAV()
         return
 
     def __repr__(self):
@@ -59,12 +58,12 @@ class VIMS_ISIS3(VIMS_OBJ):
     def readLBL(self):
         '''Read VIMS LBL header'''
         try:
-            self.lbl = pvl.load(self.fname_ir)['IsisCube']
+            self.lbl = load_cached(self.fname_ir)['IsisCube']
             sampling_IR = self.lbl['Instrument']['SamplingMode']
             wvlns_IR = pvl_fix(self.lbl['BandBin']['Center'])
             bands_IR = self.lbl['BandBin']['OriginalBand']
             try:
-                lbl_vis = pvl.load(self.fname_vis)['IsisCube']
+                lbl_vis = load_cached(self.fname_vis)['IsisCube']
                 sampling_VIS = lbl_vis['Instrument']['SamplingMode']
                 wvlns_VIS = pvl_fix(lbl_vis['BandBin']['Center'])
                 bands_VIS = lbl_vis['BandBin']['OriginalBand']
@@ -79,7 +78,7 @@ class VIMS_ISIS3(VIMS_OBJ):
             wvlns_IR = [np.nan]*256
             bands_IR = [np.nan]*256
             try:
-                self.lbl = pvl.load(self.fname_vis)['IsisCube']
+                self.lbl = load_cached(self.fname_vis)['IsisCube']
                 sampling_VIS = self.lbl['Instrument']['SamplingMode']
                 wvlns_VIS = pvl_fix(self.lbl['BandBin']['Center'])
                 bands_VIS = self.lbl['BandBin']['OriginalBand']
@@ -118,16 +117,27 @@ class VIMS_ISIS3(VIMS_OBJ):
         return
 
     def readCUB(self):
-        '''Read VIMS CUB data file'''
-        try:
-            self.cube_vis = np.array(CubeFile.open(self.fname_vis).data)
-        except NameError:
-            self.cube_vis = np.array([[[np.nan]*self.NS]*self.NL]*96)
+        '''Read VIMS CUB data file
+
+        The VIS and IR channels are memory mapped and stacked in a
+        virtual cube (read on demand). A missing channel is a
+        constant NaN view.
+        '''
+        self.cube_vis = self.readChannel('fname_vis', 96)
+        self.cube_ir = self.readChannel('fname_ir', 256)
+        self.cube = StackedCube(self.cube_vis, self.cube_ir)
+        return
 
+    def unload(self):
+        '''Release the cube data, the VIS/IR channels memory maps and the navigation'''
+        VIMS_OBJ.unload(self)
+        self.cube_vis = None
+        self.cube_ir = None
+        return
+
+    def readChannel(self, fname, nb):
+        '''Read VIMS channel data (memory mapped)'''
         try:
-            self.cube_ir = np.array(CubeFile.open(self.fname_ir).data)
+            return ISISCube(getattr(self, fname), mmap=True, special=None).cube
         except NameError:
-            self.cube_ir = np.array([[[np.nan]*self.NS]*self.NL]*256)
-
-        self.cube = np.concatenate((self.cube_vis, self.cube_ir), axis=0)
-        return
+            return nan_channel((nb, self.NL, self.NS))
@@ -2,8 +2,8 @@
 import os
 import numpy as np
 from datetime import datetime as dt
-import pvl
 
+from .cache import load_cached
 from .vims_class import VIMS_OBJ
 
 class VIMS_LBL(VIMS_OBJ):
@@ -25,7 +25,7 @@ class VIMS_LBL(VIMS_OBJ):
 
     def readLBL(self):
         '''Read VIMS LBL header'''
-        self.lbl = pvl.load(self.fname)
+        self.lbl = load_cached(self.fname)
 
         for ii, axis in enumerate(self.lbl['SPECTRAL_QUBE']['AXIS_NAME']):
             if axis == 'SAMPLE':
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 import os
+import re
 import numpy as np
 from datetime import datetime as dt
 
 from ._communs import getImgID
+from .pds import read_label, parse_keys, split_values
 
 NaN = -99999.
 
@@ -61,69 +63,27 @@ class VIMS_NAV(object):
         return fname
 
     def readLBL(self):
-        '''Read VIMS geocube LBL'''
-        with open(self.fname) as f:
-            lbl = {}; self.IDFoffset = 0
-            for line in f.readlines():
-                self.IDFoffset += len(line)
-                if line == 'END\n' or line == 'FIN\n':
-                    break
-                elif line == 'END\r\n' or line == 'FIN\r\n':
-                    self.IDFoffset += 1
-                    break
-                elif 'AXIS_NAME' in line:
-                    axisName = line.rstrip('\r\n')\
-                                   .split(' = ')[1]\
-                                   .replace('(','')\
-                                   .replace(')','')\
-                                   .split(',')
-
-                elif 'CORE_ITEMS' in line:
-                    coreItems = line.rstrip('\r\n')\
-                                    .split('=')[1]\
-                                    .replace('(','')\
-                                    .replace(')','')\
-                                    .split(',')
-
-                elif 'CORE_ITEM_BYTES' in line:
-                    self.coreItemBytes = int(line.rstrip('\r\n')
-                                                 .split(' = ')[1])
-
-                elif 'CORE_ITEM_TYPE' in line:
-                    self.coreItemType = line.rstrip('\r\n')\
-                                   .split(' = ')[1]
-
-                elif 'INSTRUMENT_HOST_NAME' in line:
-                    self.obs = line.rstrip('\r\n')\
-                                   .split(' = ')[1]\
-                                   .replace('"', '')
-
-                elif 'INSTRUMENT_ID' in line:
-                    self.inst = line.rstrip('\r\n')\
-                                    .split(' = ')[1]\
-                                    .replace('"', '')
-
-                elif 'TARGET_NAME' in line:
-                    self.target = line.rstrip('\r\n')\
-                                      .split(' = ')[1]\
-                                      .replace('"','')
-
-                elif 'START_TIME' in line and (not 'NATIVE' in line) and (not 'EARTH_RECEIVED' in line):
-                    self.start = dt.strptime(
-                                    line.rstrip('\r\n')\
-                                    .split(' = ')[1]\
-                                    .replace('"',''),
-                                    '%Y-%jT%H:%M:%S.%fZ')
-
-                elif 'STOP_TIME' in line and (not 'NATIVE' in line) and (not 'EARTH_RECEIVED' in line):
-                    self.stop = dt.strptime(
-                                    line.rstrip('\r\n')\
-                                    .split(' = ')[1]\
-                                    .replace('"',''),
-                                    '%Y-%jT%H:%M:%S.%fZ')
-
-                elif '.ker' in line:
-                    self.flyby = int(line.rstrip('\r\n')[-8:-5])
+        '''Read VIMS geocube LBL (only the label bytes are read)'''
+        label, self.IDFoffset = read_label(self.fname)
+        lbl = parse_keys(label)
+
+        axisName = split_values(lbl['AXIS_NAME'])
+        coreItems = split_values(lbl['CORE_ITEMS'])
+        self.coreItemBytes = int(lbl['CORE_ITEM_BYTES'])
+        self.coreItemType = lbl['CORE_ITEM_TYPE']
+
+        self.obs = lbl['INSTRUMENT_HOST_NAME'].replace('"', '')
+        self.inst = lbl['INSTRUMENT_ID'].replace('"', '')
+        self.target = lbl['TARGET_NAME'].replace('"', '')
+        self.start = dt.strptime(lbl['START_TIME'].replace('"', ''), '%Y-%jT%H:%M:%S.%fZ')
+        self.stop = dt.strptime(lbl['STOP_TIME'].replace('"', ''), '%Y-%jT%H:%M:%S.%fZ')
+
+        kernels = re.findall(r'(\d{3})\.ker', label)
+        if kernels:
+            self.flyby = int(kernels[-1])
+
+        self.axisName = axisName
+        self.coreItems = [int(item) for item in coreItems]
 
         for ii, axis in enumerate(axisName):
             if axis == 'SAMPLE':
@@ -142,9 +102,27 @@ class VIMS_NAV(object):
 
         return
 
-    def readNAV(self):
-        '''Read VIMS geocube data'''
-        # Read binary file
+    # Geocube planes (in file order)
+    PLANES = {
+        'lon': 0,                 # Pixel central longitude [East]
+        'lat': 1,                 # Pixel central latitude [North]
+        'inc': 2,                 # Incidence angle [deg]
+        'eme': 3,                 # Emergence angle [deg]
+        'phase': 4,               # Phase angle [deg]
+        'corners': slice(5, 13),  # Pixel corners lon/lat [deg]
+        'alt': 13,                # Altitude
+        'res': 14,                # Pixel resolution
+    }
+
+    def readNAV(self, corners=False):
+        '''Read VIMS geocube data
+
+        The geocube is memory mapped and the required planes are read
+        at once in `self.geo`. Each plane is a named view on it.
+
+        corners:
+            Load also the pixel corners and altitude planes
+        '''
         if self.coreItemType == 'SUN_INTEGER':
             arch = '>' # Big endian
         else:
@@ -157,33 +135,31 @@ class VIMS_NAV(object):
         else:
             raise ValueError('Unknown CORE_ITEM_BYTES')
 
-        dtype = np.dtype(arch+byte)
-        nbytes = self.NS * self.NL * self.coreItemBytes
-
-        shape = (self.NL, self.NS)
-
-        with open(self.fname, 'rb') as f:
-            f.seek(self.IDFoffset+2, os.SEEK_SET) # Skip Ascii header
-            self.lon = np.frombuffer(f.read(nbytes),dtype=dtype).reshape(shape) #% 360 # Pixel central longitude [East]
-            self.lat = np.frombuffer(f.read(nbytes),dtype=dtype).reshape(shape) # Pixel central latitude [North]
-            self.inc = np.frombuffer(f.read(nbytes),dtype=dtype).reshape(shape) # Incidence angle [deg]
-            self.eme = np.frombuffer(f.read(nbytes),dtype=dtype).reshape(shape) # Emergence angle [deg]
-            self.phase = np.frombuffer(f.read(nbytes),dtype=dtype).reshape(shape) # Phase angle [deg]
-            f.read(nbytes*9) # Slip cornes lon/lat and altitude
-            self.res = np.frombuffer(f.read(nbytes),dtype=dtype).reshape(shape) # Phase angle [deg]
-
-        self.lon.setflags(write=1)
-        self.lat.setflags(write=1)
-        self.inc.setflags(write=1)
-        self.eme.setflags(write=1)
-        self.phase.setflags(write=1)
-        self.res.setflags(write=1)
-
-        self.nan = (self.lon == NaN)
-        self.lon[self.nan] = np.nan
-        self.lat[self.nan] = np.nan
-        self.inc[self.nan] = np.nan
-        self.eme[self.nan] = np.nan
-        self.phase[self.nan] = np.nan
-        self.res[self.nan] = np.nan
+        # Qube axes (slowest first) transposed in (BAND, LINE, SAMPLE)
+        axes = self.axisName[::-1]
+        shape = tuple(self.coreItems[self.axisName.index(axis)] for axis in axes)
+        order = [axes.index(axis) for axis in ('BAND', 'LINE', 'SAMPLE')]
+
+        mmap = np.memmap(self.fname, dtype=np.dtype(arch+byte), mode='r',
+                         offset=self.IDFoffset+2, shape=shape).transpose(order)
+
+        if corners:
+            planes = dict(self.PLANES)
+            bands = list(range(self.NB))
+        else:
+            names = ['lon', 'lat', 'inc', 'eme', 'phase', 'res']
+            planes = {name: ii for ii, name in enumerate(names)}
+            bands = [self.PLANES[name] for name in names]
+
+        self.setGEO(np.array(mmap[bands], dtype=float), planes)
+        return
+
+    def setGEO(self, geo, planes):
+        '''Set geocube planes views and mask the NaN pixels (single pass)'''
+        self.geo = geo
+        self.nan = (geo[planes['lon']] <= NaN)
+        self.geo[:, self.nan] = np.nan
+
+        for name, plane in planes.items():
+            setattr(self, name, self.geo[plane])
         return
@@ -2,13 +2,11 @@
 import os
 import numpy as np
 from datetime import datetime as dt
-import pvl
-from planetaryimage import CubeFile
 
+from .cache import load_cached
+from .isis.isis import ISISCube
 from .vims_nav import VIMS_NAV
 
-NaN = -99999.
-
 # To remove NaN comparaison warnings
 np.warnings.filterwarnings('ignore')
 
@@ -70,7 +68,7 @@ class VIMS_NAV_ISIS3(VIMS_NAV):
 
     def readLBL(self):
         '''Read VIMS ISIS3 geocube LBL'''
-        self.lbl = pvl.load(self.fname)['IsisCube']
+        self.lbl = load_cached(self.fname)['IsisCube']
 
         self.NS = int(self.lbl['Core']['Dimensions']['Samples'])
         self.NL = int(self.lbl['Core']['Dimensions']['Lines'])
@@ -90,31 +88,32 @@ class VIMS_NAV_ISIS3(VIMS_NAV):
         self.date = self.dtime.strftime('%Y/%m/%d')
         return
 
-    def readNAV(self):
-        '''Read VIMS geocube data'''
-        cube = np.array(CubeFile.open(self.fname).data)
+    # ISIS3 geocube frames names
+    FRAMES = {
+        'Longitude': 'lon',            # Pixel central longitude [East]
+        'Latitude': 'lat',             # Pixel central latitude [North]
+        'Incidence Angle': 'inc',      # Incidence angle [deg]
+        'Emission Angle': 'eme',       # Emission angle [deg]
+        'Phase Angle': 'phase',        # Phase angle [deg]
+        'Pixel Resolution': 'res',     # Pixel resolution [km/pix]
+    }
+
+    def readNAV(self, corners=False):
+        '''Read VIMS geocube data
+
+        The geocube is memory mapped and all the frames are read
+        at once in `self.geo`. Each frame is a named view on it.
 
+        corners:
+            Not available in ISIS3 geocubes (ignored)
+        '''
+        planes = {}
         for ii, frame in enumerate(self.lbl['BandBin']['Name']):
-            if frame == 'Latitude':
-                self.lat = cube[ii]  # Pixel central latitude [North]
-            elif frame == 'Longitude':
-                self.lon = cube[ii]  # % 360 # Pixel central longitude [East]
-            elif frame == 'Pixel Resolution':
-                self.res = cube[ii]*1.e-3  # Pixel resolution [km/pix]
-            elif frame == 'Incidence Angle':
-                self.inc = cube[ii]  # Incidence angle [deg]
-            elif frame == 'Emission Angle':
-                self.eme = cube[ii]  # Emission angle [deg]
-            elif frame == 'Phase Angle':
-                self.phase = cube[ii]  # Phase angle [deg]
-            else:
+            if frame not in self.FRAMES:
                 raise ValueError('ISIS NAV frame name (%s) is unknown' % frame)
+            planes[self.FRAMES[frame]] = ii
 
-        self.nan = (self.lon < NaN)
-        self.lon[self.nan] = np.nan
-        self.lat[self.nan] = np.nan
-        self.inc[self.nan] = np.nan
-        self.eme[self.nan] = np.nan
-        self.phase[self.nan] = np.nan
-        self.res[self.nan] = np.nan
+        isis = ISISCube(self.fname, mmap=True, special=None)
+        self.setGEO(isis.read(), planes)
+        self.res *= 1.e-3  # [m/pix] -> [km/pix]
         return
@@ -2,16 +2,15 @@
 import os
 import numpy as np
 from datetime import datetime as dt
-import pvl
 
+from .cache import load_cached
+from .pds import PDSQube, start_byte
 from .vims_class import VIMS_OBJ
 
 class VIMS_TEAM(VIMS_OBJ):
     def __init__(self, imgID, root=''):
         VIMS_OBJ.__init__(self, imgID, root)
         self.readLBL()
-        self.readCUB()
-        self.setNAV()
         return
 
     def __repr__(self):
@@ -27,7 +26,7 @@ class VIMS_TEAM(VIMS_OBJ):
 
     def readLBL(self):
         '''Read VIMS LBL header'''
-        self.lbl = pvl.load(self.fname)
+        self.lbl = load_cached(self.fname)
 
         for ii, axis in enumerate(self.lbl['QUBE']['AXIS_NAME']):
             if axis == 'SAMPLE':
@@ -57,40 +56,28 @@ class VIMS_TEAM(VIMS_OBJ):
         self.bands = np.array(self.lbl['QUBE']['BAND_BIN']['BAND_BIN_ORIGINAL_BAND'])
         return
 
-    def readCUB(self):
-        '''Read VIMS CUB data file'''
-        if self.lbl['QUBE']['CORE_ITEM_TYPE'] == 'SUN_INTEGER':
-            arch = '>' # Big endian
-        else:
-            arch = '<' # Little endian
+    def readCUB(self, dtype=float):
+        '''Read VIMS CUB data file
 
-        if int(self.lbl['QUBE']['CORE_ITEM_BYTES']) == 2:
-            byte = 'i2'
-        elif int(self.lbl['QUBE']['CORE_ITEM_BYTES']) == 4:
-            byte = 'f'
-        else:
-            raise ValueError('Unknown CORE_ITEM_BYTES')
+        The qube (core and suffix planes) is memory mapped
+        and the core is copied once in (NB, NL, NS) order.
+        The suffix planes (backplanes) are kept as named
+        read-only views on the file in `self.suffix`.
 
-        dtype = np.dtype(arch+byte)
-        IDFoffset = (int(self.lbl['^QUBE']) - 1) * int(self.lbl['RECORD_BYTES'])
-        nbytes = self.NS * int(self.lbl['QUBE']['CORE_ITEM_BYTES'])
+        dtype:
+            Output data type (native qube type if `None`)
+        '''
+        if self.lbl['QUBE']['AXIS_NAME'] not in (['SAMPLE', 'BAND', 'LINE'],
+                                                 ['SAMPLE', 'LINE', 'BAND']):
+            raise TypeError('AXIS_NAME unknown')
 
-        cube = np.zeros((self.NB, self.NL, self.NS))
-        with open(self.fname) as f:
-            f.seek(IDFoffset, os.SEEK_SET) # Skip Ascii header
+        qube = PDSQube(self.fname, self.lbl['QUBE'], start_byte(self.lbl))
+        self.cube = qube.read(dtype)
+        self.suffix = qube.suffix
+        return
 
-            if self.lbl['QUBE']['AXIS_NAME'] == ['SAMPLE', 'BAND', 'LINE']:
-                for line in range(self.NL):
-                    for band in range(self.NB):
-                        sample = np.frombuffer(f.read(nbytes),dtype=dtype) # Read image sample
-                        cube[band, line, :] = sample
-            elif self.lbl['QUBE']['AXIS_NAME'] == ['SAMPLE', 'LINE', 'BAND']:
-                for band in range(self.NB):
-                    for line in range(self.NL):
-                        sample = np.frombuffer(f.read(nbytes),dtype=dtype) # Read image sample
-                        cube[band, line, :] = sample
-            else:
-                raise TypeError('AXIS_NAME unknown')
-                return None
-        self.cube = cube
+    def unload(self):
+        '''Release the cube data, the suffix memory map and the navigation'''
+        VIMS_OBJ.unload(self)
+        self.suffix = None
         return
@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
-import os
 import numpy as np
 from datetime import datetime as dt
 import pvl
-import struct
+
+from pyvims.pds import PDSQube, start_byte
 
 class VIR_TEAM(object):
     def __init__(self, imgID):
@@ -48,83 +48,19 @@ class VIR_TEAM(object):
         self.bands = np.array(self.lbl['QUBE']['BAND_BIN']['BAND_BIN_ORIGINAL_BAND'])
         return
 
-    def readCUB(self):
-        '''Read VIMS CUB data file'''
-        if self.lbl['QUBE']['CORE_ITEM_TYPE'] == 'IEEE_REAL':
-            arch = '>' # Big endian
-        else:
-            arch = '<' # Little endian
-
-        if int(self.lbl['QUBE']['CORE_ITEM_BYTES']) == 2:
-            byte = 'i2'
-        elif int(self.lbl['QUBE']['CORE_ITEM_BYTES']) == 4:
-            byte = 'f'
-        else:
-            raise ValueError('Unknown CORE_ITEM_BYTES')
-
-        dtype = np.dtype('>'+byte)
-        IDFoffset = (int(self.lbl['^HISTORY']) -1) * int(self.lbl['RECORD_BYTES'])
-        nbytes = int(self.lbl['QUBE']['CORE_ITEM_BYTES'])
-
-        cube = np.zeros((self.NB, self.NS, self.NL))
-        with open(self.fname, 'rb') as f:
-            
-            recByte = int(self.lbl['RECORD_BYTES'])
-            dataPos = self.lbl['^HISTORY'] -1  # Data Pointer
-            dim     = self.lbl['QUBE']['CORE_ITEMS']
-            sfxItem = self.lbl['QUBE']['SUFFIX_ITEMS']
-            crType  = self.lbl['QUBE']['CORE_ITEM_TYPE']
-            crByte  = int(self.lbl['QUBE']['CORE_ITEM_BYTES'])
-
-            print(dim, type(dim))
-            print(sfxItem, type(sfxItem))
-            print(crType, type(crType))
-
-            if crType == "REAL" or crType == "IEEE_REAL":
-               tp='f'
-       
+    def readCUB(self, dtype=np.float32):
+        '''Read VIR CUB data file
 
-            coreBlock=(dim[0]+sfxItem[0]-1)*(dim[1]+sfxItem[1]-1)*(dim[2]-1)*crByte
-            shape=(dim[0]+sfxItem[0]-1,(dim[1]+sfxItem[1]-1),dim[2]-1)
-            lineDim=dim[2]*crByte
+        The qube (core and suffix items) is memory mapped with a
+        structured dtype and the core is copied once in (NB, NL, NS)
+        order (the suffix items are skipped).
 
-            dataStruc=str(dim[0]-1)+tp+sfxItem[0]*'L'
-            d=(dim[1]+sfxItem[1]-1)*(dim[2]-1)*dataStruc
-            
-            #print(coreBlock)
-            #print(shape)
-            #print(dataStruc)
+        dtype:
+            Output data type (native qube type if `None`)
+        '''
+        pointer = '^QUBE' if '^QUBE' in self.lbl else '^HISTORY'
+        qube = PDSQube(self.fname, self.lbl['QUBE'], start_byte(self.lbl, pointer))
 
-            #fl=open(self.fname,'rb')
-            f.seek(dataPos*recByte, os.SEEK_SET)
-            buff=f.read()
-            out=struct.unpack_from(arch+d,buff)
-            
-            cube=np.array(out, dtype=np.float32).reshape(shape,order='F')[0:dim[0],:,:]
-            
-            #print(cube)
-            
-            
-            '''
-            f.seek(IDFoffset, os.SEEK_SET) # Skip Ascii header
-            
-            if self.lbl['QUBE']['AXIS_NAME'] == ['SAMPLE', 'BAND', 'LINE']:
-                for line in range(self.NL):
-                    for band in range(self.NB):
-                        sample = np.frombuffer(f.read(self.NS*nbytes),dtype=dtype) # Read image sample
-                        cube[band, line, :] = sample
-                        
-            elif self.lbl['QUBE']['AXIS_NAME'] == ['SAMPLE', 'LINE', 'BAND']:
-                for band in range(self.NB):
-                    for line in range(self.NL):
-                        sample = np.frombuffer(f.read(self.NS*nbytes),dtype=dtype) # Read image sample
-                        cube[band, line, :] = sample
-                        
-            elif self.lbl['QUBE']['AXIS_NAME'] == ['BAND', 'SAMPLE', 'LINE']:
-                for line in range(self.NL):
-                    for sample in range(self.NS):
-                        band = np.frombuffer(f.read(self.NB*nbytes),dtype=dtype) # Read image sample
-                        #cube[:, sample, line] = band
-            '''
-        self.cube = cube
+        self.cube = qube.read(dtype)
+        self.suffix = qube.suffix
         return
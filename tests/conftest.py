@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import pytest
+import numpy as np
+
+
+nav_id = '1487096932_1'
+
+nav_label = '''PDS_VERSION_ID = PDS3
+INSTRUMENT_HOST_NAME = "CASSINI ORBITER"
+INSTRUMENT_ID = "VIMS"
+TARGET_NAME = "TITAN"
+START_TIME = 2005-045T18:02:29.023Z
+STOP_TIME = 2005-045T18:07:32.930Z
+OBJECT = QUBE
+AXIS_NAME = (SAMPLE,LINE,BAND)
+CORE_ITEMS = ({ns},{nl},{nb})
+CORE_ITEM_BYTES = 4
+CORE_ITEM_TYPE = PC_REAL
+END_OBJECT = QUBE
+END
+'''
+
+
+@pytest.fixture
+def data():
+    return np.arange(5 * 4 * 3, dtype='f4').reshape(5, 4, 3)
+
+
+@pytest.fixture
+def geo():
+    return np.arange(15 * 4 * 3, dtype='f4').reshape(15, 4, 3)
+
+
+@pytest.fixture
+def nav_root(tmp_path, geo):
+    nb, nl, ns = geo.shape
+    with open(tmp_path / f'V{nav_id}.nav', 'wb') as f:
+        f.write(nav_label.format(ns=ns, nl=nl, nb=nb).encode())
+        f.write(b'\0\0')
+        f.write(geo.astype('<f4').tobytes())
+    return f'{tmp_path}/'
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import pytest
+import threading
+import time
+
+from pyvims import load_many, VIMS_LBL
+
+
+cube_root = 'tests/data/'
+cube_id = '1487096932_1'
+
+
+class Loader:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, img_id, root):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+        time.sleep(.01 * (img_id % 3))
+
+        with self.lock:
+            self.running -= 1
+
+        if img_id == 5:
+            raise ValueError('Corrupted cube')
+
+        return img_id * 10
+
+
+def test_load_many_ordered():
+    loader = Loader()
+    results = list(load_many(range(10), workers=3, loader=loader))
+
+    assert [res.img_id for res in results] == list(range(10))
+    assert results[0].data == 0
+    assert results[9].data == 90
+
+    assert results[5].data is None
+    assert isinstance(results[5].error, ValueError)
+
+    assert loader.max_running <= 3
+
+
+def test_load_many_completed():
+    loader = Loader()
+    results = list(load_many(range(10), workers=4, window=2,
+                             ordered=False, loader=loader))
+
+    assert sorted(res.img_id for res in results) == list(range(10))
+    assert loader.max_running <= 2
+
+
+def test_load_many_lazy():
+    loader = Loader()
+    results = load_many(range(10), workers=2, window=2, loader=loader)
+
+    # Nothing submitted before the first result
+    time.sleep(.05)
+    assert loader.max_running == 0
+
+    assert next(results).img_id == 0
+
+    # Pending loads cancelled and workers joined on close
+    results.close()
+    assert loader.running == 0
+    assert loader.max_running <= 2
+
+
+def test_load_many_vims():
+    results = list(load_many([cube_id, '1000000000_1'], root=cube_root))
+
+    assert isinstance(results[0].data, VIMS_LBL)
+    assert results[0].error is None
+    assert isinstance(results[1].error, NameError)
+
+    results = list(load_many([cube_id], root=cube_root,
+                             fields=['target', 'NS'], processes=2))
+
+    assert results[0].data == {'target': 'TITAN', 'NS': 42}
+
+    with pytest.raises(ValueError):
+        load_many([cube_id], processes=2)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import sqlite3
+
+import pvl
+
+from pyvims import VIMS_LBL
+from pyvims.cache import (LabelCache, enable_cache, disable_cache, load_cached,
+                          dumps, loads)
+from pyvims.isis.header import parse_label
+
+
+cube_root = 'tests/data/'
+cube_id = '1487096932_1'
+lbl = cube_root + 'v1487096932_1.lbl'
+
+ISIS_LABEL = '''Object = IsisCube
+  Group = Instrument
+    StartTime = 2005-015T12:00:00.123
+    ExposureDuration = (160.0 <MS>, 5.0 <MS>)
+  End_Group
+End_Object
+Object = Table
+  Name = A
+End_Object
+Object = Table
+  Name = B
+End_Object
+End
+'''
+
+
+def test_label_cache(tmp_path):
+    cache = LabelCache(str(tmp_path / 'cache.sqlite'))
+    assert len(cache) == 0
+
+    label = cache.get(lbl)
+    assert len(cache) == 1
+    assert cache.get(lbl) == label == pvl.load(lbl)
+
+    # JSON serialized labels
+    with sqlite3.connect(str(cache)) as db:
+        text, = db.execute('SELECT label FROM labels').fetchone()
+        assert json.loads(text)['block'] == 'pvl.collections.PVLModule'
+
+        # Invalid cached label reloaded
+        db.execute("UPDATE labels SET label = 'cos\nsystem\n'")
+    db.close()
+
+    assert cache.get(lbl) == label
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_label_cache_serialization():
+    isis = parse_label(ISIS_LABEL)
+    label = loads(dumps(isis))
+
+    assert label == isis
+    assert type(label) == type(isis)
+    assert label['IsisCube']['Instrument']['ExposureDuration'][0].units == 'MS'
+    assert [table['Name'] for key, table in label if key == 'Table'] == ['A', 'B']
+
+    pds = pvl.load(lbl)
+    assert loads(dumps(pds)) == pds
+
+
+def test_label_cache_enable(tmp_path):
+    cache = enable_cache(root=str(tmp_path))
+
+    try:
+        assert os.path.isfile(str(cache))
+
+        cub = VIMS_LBL(cube_id, root=cube_root)
+        assert len(cache) == 1
+        assert VIMS_LBL(cube_id, root=cube_root).target == cub.target
+        assert len(cache) == 1
+    finally:
+        disable_cache()
+
+    assert load_cached(lbl) == pvl.load(lbl)
+    assert len(cache) == 1
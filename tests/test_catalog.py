@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+import pytest
+import os
+import sqlite3
+from datetime import datetime as dt
+
+from pyvims import VIMS, VIMS_LBL
+from pyvims.catalog import FileIndex, MetaCatalog, match_product
+from pyvims.catalog.meta import extract_metadata, pds_metadata
+
+
+cube_root = 'tests/data/'
+cube_id = '1487096932_1'
+
+
+@pytest.fixture
+def root(tmp_path):
+    for fname in ['qub/v1487096932_1.qub', 'qub/v1487096932_1.lbl',
+                  'cub/2005/C1487096932_1_ir.cub', 'cub/2005/N1487096932_1_ir.cub',
+                  'cub/2005/C1487096932_1_vis_cal.cub', 'cub/README.txt']:
+        fname = tmp_path / fname
+        fname.parent.mkdir(parents=True, exist_ok=True)
+        fname.write_bytes(b'0123')
+    return tmp_path
+
+
+def test_match_product():
+    assert match_product('v1487096932_1.qub') == (cube_id, 'QUB')
+    assert match_product('C1487096932_1_vis.cub') == (cube_id, 'CLN_VIS')
+    assert match_product('C1487096932_1_vis_dns.cub') == (cube_id, 'DNS_VIS')
+    assert match_product('1487096932_1.tif') == (cube_id, 'GEOTIFF')
+    assert match_product('README.txt') is None
+
+
+def test_file_index(root):
+    index = FileIndex(root)
+
+    assert len(index) == 1
+    assert cube_id in index
+    assert index.img_ids() == [cube_id]
+    assert index.img_ids('TEAM') == []
+
+    products = index[cube_id]
+    assert set(products) == {'QUB', 'LBL', 'CLN_IR', 'NAV_IR', 'CAL_VIS'}
+    assert products['NAV_IR'] == str(root / 'cub' / '2005' / 'N1487096932_1_ir.cub')
+    assert index.products(cube_id)['QUB'][1] == 4
+    assert index.find(cube_id, 'CLN_VIS') is None
+
+    with pytest.raises(KeyError):
+        _ = index['1000000000_1']
+
+    # Incremental rescans
+    assert index.scan() == 0
+
+    (root / 'cub' / '2005' / 'C1487096932_1_vis.cub').write_bytes(b'')
+    (root / 'qub' / 'v1487096932_1.qub').unlink()
+
+    assert index.scan() == 2
+    assert 'CLN_VIS' in index[cube_id]
+    assert 'QUB' not in index[cube_id]
+
+    (root / 'cub' / '2005' / 'C1487096932_1_ir.cub').unlink()
+    (root / 'cub' / '2005' / 'N1487096932_1_ir.cub').unlink()
+    (root / 'cub' / '2005' / 'C1487096932_1_vis_cal.cub').unlink()
+    (root / 'cub' / '2005' / 'C1487096932_1_vis.cub').unlink()
+    (root / 'cub' / '2005').rmdir()
+
+    # Persistent index
+    index = FileIndex(root, scan=False)
+    assert 'CLN_VIS' in index[cube_id]
+
+    assert index.scan() == 1
+    assert set(index[cube_id]) == {'LBL'}
+
+
+def test_vims_index(tmp_path):
+    root = os.path.abspath(cube_root)
+    index = FileIndex(root, fname=str(tmp_path / 'index.sqlite'))
+
+    cub = VIMS(cube_id, index=index)
+    assert isinstance(cub, VIMS_LBL)
+    assert cub.root == os.path.join(root, '')
+
+
+ISIS_LABEL = '''Object = IsisCube
+  Object = Core
+    Group = Dimensions
+      Samples = 64
+      Lines   = 48
+      Bands   = 96
+    End_Group
+  End_Object
+
+  Group = Instrument
+    SpacecraftName   = Cassini-Huygens
+    InstrumentId     = VIMS
+    Channel          = VIS
+    TargetName       = TITAN
+    StartTime        = 2006-189T12:00:00.000
+    StopTime         = 2006-189T12:05:00.500
+    ExposureDuration = (320.0 <IR>, 10000.0 <VIS>)
+    SamplingMode     = HI-RES
+  End_Group
+
+  Group = Archive
+    SequenceId    = S21
+    SequenceTitle = VIMS_022TI_MEDRES001_PRIME
+  End_Group
+End_Object
+End
+'''
+
+
+def test_meta_catalog(tmp_path):
+    root = tmp_path / 'data'
+    root.mkdir()
+    (root / 'v1487096932_1.lbl').write_bytes(
+        open(cube_root + 'v1487096932_1.lbl', 'rb').read())
+    (root / 'C1530000000_1_vis.cub').write_text(ISIS_LABEL + '\0' * 128)
+    (root / 'C1530000001_1_ir.cub').write_text('Corrupted label')
+
+    catalog = MetaCatalog(str(root))
+
+    errors = catalog.build(workers=2)
+
+    assert list(errors) == ['1530000001_1']
+    assert len(catalog) == 2
+
+    meta = catalog[cube_id]
+    assert meta['target'] == 'TITAN'
+    assert meta['start'] == '2005-02-14T18:02:29.023000'
+    assert meta['mode_ir'] == 'NORMAL'
+    assert meta['expo_vis'] == 6720
+    assert meta['ns'] == 42
+
+    meta = catalog['1530000000_1']
+    assert meta['mode_vis'] == 'HI-RES'
+    assert meta['mode_ir'] is None
+    assert meta['seq'] == 'S21'
+    assert meta['nl'] == 48
+
+    assert catalog.query(target='titan') == [cube_id, '1530000000_1']
+    assert catalog.query(mode='HI-RES') == ['1530000000_1']
+    assert catalog.query(start=dt(2005, 2, 14, 18, 5),
+                         stop='2005-02-15T00:00:00') == [cube_id]
+    assert catalog.query(target='TITAN', seq='S08', ns=42, nl=42) == [cube_id]
+    assert catalog.query(target='ENCELADUS') == []
+
+    # IR or VIS exposure ranges
+    assert catalog.query(expo=(100, 200)) == [cube_id]
+    assert catalog.query(expo=(7000, None)) == ['1530000000_1']
+    assert catalog.query(expo=(300, None)) == [cube_id, '1530000000_1']
+    assert catalog.query(expo=(None, 100)) == []
+
+    with sqlite3.connect(str(catalog)) as db:
+        plan = db.execute('EXPLAIN QUERY PLAN SELECT img_id FROM metadata '
+                          'WHERE (expo_ir BETWEEN 1 AND 2 OR expo_vis BETWEEN 1 AND 2)')
+        plan = ' '.join(row[-1] for row in plan)
+    db.close()
+
+    assert 'metadata_expo_ir' in plan
+    assert 'metadata_expo_vis' in plan
+
+    # Only the modified images are extracted
+    assert catalog.build(workers=1) == {'1530000001_1': errors['1530000001_1']}
+
+
+QUB_LABEL = '''PDS_VERSION_ID = PDS3
+RECORD_BYTES = 512
+^QUBE = 3
+OBJECT = QUBE
+  AXIS_NAME = (SAMPLE, BAND, LINE)
+  CORE_ITEMS = (64, 352, 32)
+  INSTRUMENT_HOST_NAME = "CASSINI ORBITER"
+  TARGET_NAME = ENCELADUS
+  START_TIME = "2005-068T05:12:43.165Z"
+  STOP_TIME = "2005-068T05:14:13.431Z"
+  EXPOSURE_DURATION = (80.0, 5120.0)
+  SAMPLING_MODE_ID = (HI-RES, NORMAL)
+  SEQUENCE_ID = S09
+  SEQUENCE_TITLE = VIMS_004EN_GLOBMAP001_PRIME
+END_OBJECT = QUBE
+END
+'''
+
+
+def test_pds_metadata_qub(tmp_path):
+    fname = tmp_path / 'v1489049889_1.qub'
+    fname.write_bytes(QUB_LABEL.encode().ljust(1024, b' ') + b'\xff' * 128)
+
+    meta = pds_metadata(str(fname))
+
+    assert meta['target'] == 'ENCELADUS'
+    assert meta['start'] == '2005-03-09T05:12:43.165000'
+    assert meta['mode_ir'] == 'HI-RES'
+    assert meta['mode_vis'] == 'NORMAL'
+    assert meta['expo_ir'] == 80
+    assert meta['seq_title'] == 'VIMS_004EN_GLOBMAP001_PRIME'
+    assert meta['ns'] == 64
+    assert meta['nl'] == 32
+
+    img_id, meta, error = extract_metadata(
+        ('1489049889_1', {'QUB': (str(fname), fname.stat().st_size)}))
+    assert error is None
+    assert meta['seq'] == 'S09'
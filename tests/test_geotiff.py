@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+import pytest
+import os
+
+import numpy as np
+
+import pyvims.geotiff.geotiff as geotiff_module
+from pyvims.geotiff import GeoTiff
+from pyvims.geotiff.geotiff import overviews
+
+
+NB, NY, NX = 3, 4, 5
+
+
+class FakeBand:
+
+    def __init__(self, nodata=None, metadata=None):
+        self.nodata = nodata
+        self.metadata = metadata or {}
+
+    def GetNoDataValue(self):
+        return self.nodata
+
+    def GetMetadataItem(self, key):
+        return self.metadata.get(key)
+
+
+class FakeDataset:
+
+    def __init__(self, data, bands, metadata=None):
+        self.data = data
+        self.bands = bands
+        self.metadata = metadata or {}
+        self.RasterCount, self.RasterYSize, self.RasterXSize = data.shape
+        self.reads = 0
+
+    def ReadAsArray(self, xoff, yoff, xsize, ysize, buf_obj, band_list=None):
+        self.reads += 1
+        self.buf = buf_obj
+        index = slice(None) if band_list is None else np.array(band_list) - 1
+        buf_obj[:] = self.data[index, yoff:yoff + ysize, xoff:xoff + xsize].reshape(buf_obj.shape)
+        return buf_obj
+
+    def GetRasterBand(self, i):
+        return self.bands[i - 1]
+
+    def GetMetadataItem(self, key):
+        return self.metadata.get(key)
+
+
+@pytest.fixture
+def data():
+    data = np.arange(NB * NY * NX, dtype='f4').reshape(NB, NY, NX)
+    data[0, 0, 0] = -1
+    data[1, 2, 3] = -9
+    data[2, 3, 4] = -1
+    return data
+
+
+@pytest.fixture
+def tif(data):
+    geotiff = GeoTiff('test', read=False)
+    geotiff.ds = FakeDataset(data, [
+        FakeBand(-1, {'GTIFF_DIM_wvln': '0.35'}),
+        FakeBand(-9, {'GTIFF_DIM_wvln': '0.36'}),
+        FakeBand(None, {'GTIFF_DIM_wvln': '0.37'}),
+    ])
+    return geotiff
+
+
+def test_geotiff_read_all(tif, data):
+    cube = tif.read_all()
+
+    assert tif.ds.reads == 1
+    assert cube.shape == (NB, NY, NX)
+    assert cube.dtype == np.float64
+
+    # Filled in place by GDAL
+    assert cube is tif.ds.buf
+
+    # NoData values are band specific
+    assert np.isnan(cube[0, 0, 0])
+    assert np.isnan(cube[1, 2, 3])
+    assert cube[2, 3, 4] == -1
+    assert np.count_nonzero(np.isnan(cube)) == 2
+
+    valid = ~np.isnan(cube)
+    np.testing.assert_array_equal(cube[valid], data[valid])
+
+
+def test_geotiff_read_bands(tif, data):
+    cube = tif.read_bands([3, 2], window=(1, 2, 3, 2))
+
+    assert tif.ds.reads == 1
+    assert cube.shape == (2, 2, 3)
+
+    np.testing.assert_array_equal(cube[0], data[2, 2:4, 1:4])
+    assert np.isnan(cube[1, 0, 2])
+    np.testing.assert_array_equal(cube[1, 1], data[1, 3, 1:4])
+
+    cube = tif.read_bands([2])
+    assert cube.shape == (1, NY, NX)
+    assert np.shares_memory(cube, tif.ds.buf)
+    assert np.isnan(cube[0, 2, 3])
+
+
+def test_geotiff_wvlns(tif):
+    # Fallback on the bands metadata
+    np.testing.assert_array_equal(tif.wvlns, [.35, .36, .37])
+
+    # Dataset wavelengths table
+    tif.ds.metadata['VIMS_WVLNS'] = '1.0,1.5,2.0'
+    np.testing.assert_array_equal(tif.wvlns, [1., 1.5, 2.])
+
+
+class FakeWriteBand:
+
+    def __init__(self):
+        self.data, self.nodata, self.metadata = None, None, {}
+
+    def SetNoDataValue(self, value):
+        self.nodata = value
+
+    def WriteArray(self, data):
+        self.data = data
+
+    def SetMetadataItem(self, key, value):
+        self.metadata[key] = value
+
+
+class FakeWriteDataset:
+
+    def __init__(self, nb):
+        self.bands = [FakeWriteBand() for _ in range(nb)]
+        self.overviews = None
+
+    def SetGeoTransform(self, geotransform):
+        self.geotransform = geotransform
+
+    def SetMetadata(self, metadata):
+        self.metadata = metadata
+
+    def SetProjection(self, wkt):
+        self.wkt = wkt
+
+    def GetRasterBand(self, i):
+        return self.bands[i - 1]
+
+    def BuildOverviews(self, resampling, levels):
+        self.overviews = (resampling, levels)
+
+    def FlushCache(self):
+        pass
+
+
+class FakeDriver:
+
+    def __init__(self, copy=True):
+        self.copy = copy
+        self.created, self.copied = None, None
+
+    def Create(self, fname, nx, ny, nb, dtype, options):
+        open(fname, 'wb').close()
+        self.created = (fname, nx, ny, nb, options, FakeWriteDataset(nb))
+        return self.created[-1]
+
+    def CreateCopy(self, fname, ds, strict, options):
+        if not self.copy:
+            return None
+        self.copied = (fname, ds, options)
+        return FakeWriteDataset(0)
+
+    def Delete(self, fname):
+        os.remove(fname)
+
+
+class FakeSRS:
+
+    def ExportToWkt(self):
+        return 'WKT'
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    driver = FakeDriver()
+    monkeypatch.setattr(geotiff_module.gdal, 'GetDriverByName',
+                        lambda name: driver, raising=False)
+    monkeypatch.setattr(geotiff_module.gdal, 'GDT_Float32', 6, raising=False)
+    return driver
+
+
+def create(tmp_path, bands, nb=NB, nx=600, ny=300, **kwargs):
+    geotiff = GeoTiff(str(tmp_path / 'test.tif'), read=False)
+    geotiff.create(nx, ny, nb, (0, 1, 0, 0, 0, -1), {'KEY': 'VALUE'}, FakeSRS(),
+                   bands, [{'GTIFF_DIM_wvln': w} for w in range(nb)], **kwargs)
+    return geotiff
+
+
+def test_geotiff_overviews():
+    assert overviews(64, 64) == []
+    assert overviews(256, 256) == []
+    assert overviews(257, 10) == [2]
+    assert overviews(1024, 700) == [2, 4]
+    assert overviews(1025, 10) == [2, 4, 8]
+    assert overviews(1024, 700, blocksize=128) == [2, 4, 8]
+
+
+def test_geotiff_create(tmp_path, driver):
+    bands = (np.full((300, 600), i, dtype=float) for i in range(NB))
+    geotiff = create(tmp_path, bands)
+
+    tmp, nx, ny, nb, options, ds = driver.created
+    assert tmp == str(tmp_path / 'test.tmp.tif')
+    assert (nx, ny, nb) == (600, 300, NB)
+    assert 'TILED=YES' in options
+    assert 'BLOCKXSIZE=256' in options
+
+    # Bands streamed as float32
+    for i, band in enumerate(ds.bands):
+        assert band.data.dtype == np.float32
+        assert (band.data == i).all()
+        assert band.nodata == -1
+        assert band.metadata == {'GTIFF_DIM_wvln': str(i)}
+
+    assert ds.metadata == {'KEY': 'VALUE'}
+    assert ds.overviews == ('AVERAGE', [2, 4])
+
+    fname, src, options = driver.copied
+    assert fname == str(geotiff)
+    assert src is ds
+    for option in ['TILED=YES', 'COPY_SRC_OVERVIEWS=YES', 'INTERLEAVE=PIXEL',
+                   'COMPRESS=LZW', 'PREDICTOR=3']:
+        assert option in options
+
+    # Temporary file removed
+    assert not os.path.exists(tmp)
+
+
+def test_geotiff_create_options(tmp_path, driver):
+    create(tmp_path, np.zeros((NB, 300, 600)), codec='DEFLATE', predictor=None,
+           blocksize=128, resampling='NEAREST', noDataValue=0)
+
+    _, _, _, _, options, ds = driver.created
+    assert 'BLOCKYSIZE=128' in options
+    assert ds.bands[0].nodata == 0
+    assert ds.overviews == ('NEAREST', [2, 4, 8])
+
+    _, _, options = driver.copied
+    assert 'COMPRESS=DEFLATE' in options
+    assert not any(option.startswith('PREDICTOR') for option in options)
+
+    create(tmp_path, np.zeros((NB, 300, 600)), codec=None, resampling=None)
+
+    _, _, _, _, _, ds = driver.created
+    assert ds.overviews is None
+
+    _, _, options = driver.copied
+    assert not any(option.startswith(('COMPRESS', 'PREDICTOR')) for option in options)
+
+
+def test_geotiff_create_errors(tmp_path, driver):
+    bands = iter([np.zeros((300, 600))])
+
+    with pytest.raises(ValueError):
+        create(tmp_path, bands)
+
+    assert not os.path.exists(driver.created[0])
+
+    driver.copy = False
+    with pytest.raises(IOError):
+        create(tmp_path, np.zeros((NB, 300, 600)))
+
+    assert not os.path.exists(driver.created[0])
+
+
+def test_geotiff_create_cog(tmp_path):
+    gdal = pytest.importorskip('osgeo.gdal', minversion='3.1')
+    osr = pytest.importorskip('osgeo.osr')
+
+    srs = osr.SpatialReference()
+    srs.SetWellKnownGeogCS('WGS84')
+
+    nb, nx, ny = 2, 64, 48
+    data = np.arange(nb * ny * nx, dtype=float).reshape(nb, ny, nx)
+
+    geotiff = GeoTiff(str(tmp_path / 'test.tif'), read=False)
+    geotiff.create(nx, ny, nb, (0, 1, 0, 0, 0, -1), {'KEY': 'VALUE'}, srs,
+                   data, [{'GTIFF_DIM_wvln': str(w)} for w in range(nb)],
+                   blocksize=16)
+
+    assert not os.path.exists(str(tmp_path / 'test.tmp.tif'))
+
+    ds = gdal.Open(str(geotiff))
+    band = ds.GetRasterBand(1)
+
+    assert ds.RasterCount == nb
+    assert band.GetBlockSize() == [16, 16]
+    assert ds.GetMetadataItem('INTERLEAVE', 'IMAGE_STRUCTURE') == 'PIXEL'
+    assert ds.GetMetadataItem('COMPRESSION', 'IMAGE_STRUCTURE') == 'LZW'
+    assert band.GetOverviewCount() == len(overviews(nx, ny, blocksize=16)) == 2
+
+    # Cloud optimized layout: smallest overview data first
+    bands = [band.GetOverview(i) for i in range(band.GetOverviewCount())][::-1] + [band]
+    offsets = [int(b.GetMetadataItem('BLOCK_OFFSET_0_0', 'TIFF')) for b in bands]
+    assert offsets == sorted(offsets)
+
+    np.testing.assert_array_equal(band.ReadAsArray(), data[0])
+    assert band.GetNoDataValue() == -1
+    ds = None
+
+    try:
+        from osgeo_utils.samples.validate_cloud_optimized_geotiff import validate
+    except ImportError:
+        return
+
+    _, errors, _ = validate(str(geotiff), full_check=True)
+    assert errors == []
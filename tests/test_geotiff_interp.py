@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import pytest
+import numpy as np
+
+from scipy.interpolate import griddata
+
+from pyvims.geotiff.interp import GridInterpolator
+
+
+@pytest.fixture
+def points():
+    rng = np.random.RandomState(42)
+    x, y = rng.uniform(-1, 1, (2, 200))
+    x[0] = np.nan
+    return x, y
+
+
+@pytest.fixture
+def grid():
+    Y, X = np.mgrid[1:-1:15j, -1:1:12j]
+    return X, Y
+
+
+def test_grid_interpolator(points, grid):
+    x, y = points
+    X, Y = grid
+    valid = np.isfinite(x)
+
+    values = np.array([np.sin(3 * x) * y, x ** 2 - y, x + 2 * y])
+
+    for method in ['nearest', 'linear', 'cubic']:
+        interp = GridInterpolator(x, y, X, Y, method=method)
+        assert repr(interp) == f'<GridInterpolator: {method} | 199 points -> (15, 12)>'
+
+        # Precomputed weights (values and gradients for cubic)
+        assert interp.matrix.shape == (15 * 12, (3 if method == 'cubic' else 1) * 199)
+
+        data = interp(values)
+        assert data.shape == (3, 15, 12)
+
+        for band, img in zip(values, data):
+            expected = griddata((x[valid], y[valid]), band[valid], (X, Y), method=method)
+            np.testing.assert_allclose(img, expected, atol=1e-10)
+
+        np.testing.assert_allclose(interp(values[1]), data[1])
+        np.testing.assert_array_equal(interp(values, workers=2), data)
+        np.testing.assert_array_equal(interp(values, workers=8), data)
+
+    assert np.isnan(data).any()
+
+    with pytest.raises(ValueError):
+        _ = GridInterpolator(x, y, X, Y, method='quintic')
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import pytest
+import numpy as np
+
+from pyvims.geotiff.operators import (OperatorCache, dumps, loads, operator_key,
+                                      reprojection)
+
+
+@pytest.fixture
+def nav():
+    lat, lon = np.mgrid[30:-30:8j, -40:40:10j]
+    limb = np.zeros(lon.shape, dtype=bool)
+    limb[0, :3] = True
+    return lon, lat, limb
+
+
+def test_operator_key(nav):
+    lon, lat, limb = nav
+    key = operator_key(lon, lat, limb, 0, 0, 2575, 16, 'linear')
+
+    assert key == operator_key(lon.copy(), lat, limb, 0., 0., 2575., 16, 'linear')
+    assert key != operator_key(lon, lat, ~limb, 0, 0, 2575, 16, 'linear')
+    assert key != operator_key(lon, lat, limb, 0, 0, 2575, 16, 'cubic')
+    assert key != operator_key(lon, lat, limb, 0, 0, 2575, 17, 'linear')
+
+
+def test_operator_cache(nav, tmp_path):
+    lon, lat, limb = nav
+    values = np.cos(np.radians(lon[~limb])) * lat[~limb]
+
+    expected = reprojection(lon, lat, limb, 0, 0, 2575, 16)
+    cache = OperatorCache(maxsize=2, fname=str(tmp_path / 'operators.sqlite'))
+
+    op = cache.get(lon, lat, limb, 0, 0, 2575, 16)
+    assert len(cache) == 1
+    assert cache.get(lon, lat, limb, 0, 0, 2575, 16) is op
+    assert op.geotransform == expected.geotransform
+    np.testing.assert_array_equal(op.interpolator(values), expected.interpolator(values))
+
+    # Least recently used operator discarded from memory
+    cache.get(lon, lat, limb, 0, 0, 2575, 20)
+    cache.get(lon, lat, limb, 0, 0, 2575, 24, method='cubic')
+    assert len(cache) == 2
+    assert operator_key(lon, lat, limb, 0, 0, 2575, 16, 'linear') not in cache
+
+    # Reloaded from the disk cache
+    disk = OperatorCache(fname=cache.fname)
+    op = disk.get(lon, lat, limb, 0, 0, 2575, 24, method='cubic')
+    np.testing.assert_array_equal(
+        op.interpolator(values),
+        reprojection(lon, lat, limb, 0, 0, 2575, 24, method='cubic').interpolator(values))
+
+    # Least recently used operators discarded from the disk
+    assert disk.nrows == 3
+
+    disk.maxrows = 2
+    disk.get(lon, lat, limb, 0, 0, 2575, 28)
+    assert disk.nrows == 2
+    assert disk._load(operator_key(lon, lat, limb, 0, 0, 2575, 20, 'linear')) is None
+
+    cache.clear()
+    assert len(cache) == 0
+    assert OperatorCache(fname=cache.fname)._load(
+        operator_key(lon, lat, limb, 0, 0, 2575, 24, 'cubic')) is None
+
+
+@pytest.mark.parametrize('method', ['nearest', 'linear', 'cubic'])
+def test_operator_serialization(nav, method):
+    lon, lat, limb = nav
+    values = np.cos(np.radians(lon[~limb])) * lat[~limb]
+
+    expected = reprojection(lon, lat, limb, 0, 0, 2575, 16, method=method)
+    data = dumps(expected)
+
+    # NumPy arrays archive (no pickle)
+    assert data[:2] == b'PK'
+
+    op = loads(data)
+    assert op.geotransform == expected.geotransform
+    assert repr(op.interpolator) == repr(expected.interpolator)
+    np.testing.assert_array_equal(op.interpolator(values), expected.interpolator(values))
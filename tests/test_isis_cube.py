@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+import numpy as np
+
+from pyvims.isis.isis import ISISCube
+from pyvims.isis.core import ISISCore
+from pyvims.isis.tiles import ISISTiles
+from pyvims.isis.special import NULL, HRS
+
+
+NB, NL, NS = 5, 4, 3
+start_byte = 2048
+
+isis_label = '''Object = IsisCube
+  Object = Core
+    StartByte   = {start}
+    Format      = {fmt}
+    {tiles}
+    Group = Dimensions
+      Samples = {ns}
+      Lines   = {nl}
+      Bands   = {nb}
+    End_Group
+
+    Group = Pixels
+      Type       = Real
+      ByteOrder  = Lsb
+      Base       = {base}
+      Multiplier = {mult}
+    End_Group
+  End_Object
+
+  Group = Instrument
+    SpacecraftName = Cassini-Huygens
+    InstrumentId   = VIMS
+    TargetName     = TITAN
+    StartTime      = 2005-045T18:02:29.023
+    StopTime       = 2005-045T18:07:32.930
+  End_Group
+
+  Group = BandBin
+    OriginalBand = ({bands})
+    Center       = ({wvlns})
+  End_Group
+End_Object
+End
+'''
+
+
+# Split cube data in ISIS tiles (with padding)
+def tiled(data, tl, ts):
+    nb, nl, ns = data.shape
+    ntl, nts = -(-nl // tl), -(-ns // ts)
+    pad = np.zeros((nb, ntl * tl, nts * ts), dtype=data.dtype)
+    pad[:, :nl, :ns] = data
+    return pad.reshape(nb, ntl, tl, nts, ts).transpose(0, 1, 3, 2, 4)
+
+
+def isis_cube(fname, data, base=0., mult=1., tiles=None):
+    nb, nl, ns = data.shape
+
+    if tiles is None:
+        fmt, tiles = 'BandSequential', ''
+        core = data
+    else:
+        fmt, (tl, ts) = 'Tile', tiles
+        tiles = f'TileSamples = {ts}\n    TileLines = {tl}'
+        core = tiled(data, tl, ts)
+
+    label = isis_label.format(
+        start=start_byte + 1, fmt=fmt, tiles=tiles, ns=ns, nl=nl, nb=nb,
+        base=base, mult=mult,
+        bands=', '.join(str(b + 1) for b in range(nb)),
+        wvlns=', '.join(str(1. + .5 * b) for b in range(nb)),
+    ).encode()
+
+    with open(fname, 'wb') as f:
+        f.write(label.ljust(start_byte, b' '))
+        f.write(core.astype('<f4').tobytes())
+
+    return str(fname)
+
+
+@pytest.fixture
+def fname(tmp_path, data):
+    return isis_cube(tmp_path / 'C1487096932_1_ir.cub', data, base=1., mult=2.)
+
+
+def test_isis_cube_load(fname, data):
+    isis = ISISCube(fname)
+
+    assert isis.shape == (NB, NL, NS)
+    assert isis.dtype == np.dtype('<f4')
+    np.testing.assert_array_equal(isis.cube, 2. * data + 1.)
+
+
+def test_isis_cube_mmap(fname, data):
+    isis = ISISCube(fname, mmap=True)
+    cube = isis.cube
+
+    assert isinstance(cube, ISISCore)
+    assert isinstance(isis.raw, np.memmap)
+    assert not isis.raw.flags.writeable
+    assert cube.shape == (NB, NL, NS)
+
+    np.testing.assert_array_equal(cube[2], 2. * data[2] + 1.)
+    np.testing.assert_array_equal(cube[:, 1, 2], 2. * data[:, 1, 2] + 1.)
+    np.testing.assert_array_equal(np.asarray(cube), 2. * data + 1.)
+
+
+@pytest.fixture
+def fname_tiled(tmp_path, data):
+    return isis_cube(tmp_path / 'C1487096932_1_vis.cub', data,
+                     base=1., mult=2., tiles=(3, 2))
+
+
+def test_isis_cube_tiled(fname_tiled, data):
+    isis = ISISCube(fname_tiled)
+
+    assert isis.is_tiled
+    assert isis._tiles_shape == (NB, 2, 2, 3, 2)
+    np.testing.assert_array_equal(isis.cube, 2. * data + 1.)
+
+
+def test_isis_cube_tiled_mmap(fname_tiled, data):
+    cube = ISISCube(fname_tiled, mmap=True).cube
+    expected = 2. * data + 1.
+
+    assert isinstance(cube.raw, ISISTiles)
+    assert cube.shape == (NB, NL, NS)
+
+    np.testing.assert_array_equal(cube[...], expected)
+    np.testing.assert_array_equal(cube[1], expected[1])
+    np.testing.assert_array_equal(cube[:, 3, 2], expected[:, 3, 2])
+    np.testing.assert_array_equal(cube[1:4, 2:, :1], expected[1:4, 2:, :1])
+    np.testing.assert_array_equal(cube[[4, 0], -1], expected[[4, 0], -1])
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_isis_cube_read(fname, fname_tiled, data, mmap):
+    expected = 2. * data + 1.
+
+    for f in (fname, fname_tiled):
+        isis = ISISCube(f, mmap=mmap)
+
+        np.testing.assert_array_equal(isis.read(bands=3), expected[3])
+        np.testing.assert_array_equal(isis.read(lines=1, samples=2), expected[:, 1, 2])
+        np.testing.assert_array_equal(
+            isis.read(bands=[0, 4], lines=slice(1, 3), samples=[0, 2]),
+            expected[[0, 4]][:, 1:3][:, :, [0, 2]])
+
+    isis = ISISCube(fname)
+    isis.cube
+    np.testing.assert_array_equal(isis.read(bands=[1, 2], samples=0), expected[1:3, :, 0])
+
+
+@pytest.fixture
+def fname_special(tmp_path, data):
+    data = data.copy()
+    data[0, 0, 0] = np.array(0xFF7FFFFB, dtype='u4').view('f4')  # NULL
+    data[1, 2, 1] = np.array(0xFF7FFFFF, dtype='u4').view('f4')  # HRS
+    return isis_cube(tmp_path / 'C1487096932_1_sp.cub', data)
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_isis_cube_special(fname_special, mmap):
+    cube = ISISCube(fname_special, mmap=mmap).cube[...]
+
+    assert np.isnan(cube[0, 0, 0])
+    assert np.isnan(cube[1, 2, 1])
+    assert np.sum(np.isnan(cube)) == 2
+
+    cube = ISISCube(fname_special, mmap=mmap, special='mask').cube[...]
+
+    assert isinstance(cube, np.ma.MaskedArray)
+    assert cube.mask.sum() == 2
+    assert cube.mask[1, 2, 1]
+
+    cube = ISISCube(fname_special, mmap=mmap, special=None).cube[...]
+
+    assert cube[0, 0, 0] < -3.4e38
+    assert not np.isnan(cube).any()
+
+
+def test_isis_cube_specials_bitmask(fname_special):
+    specials = ISISCube(fname_special).specials
+
+    assert specials.dtype == np.uint8
+    assert specials.shape == (NB, NL, NS)
+    assert specials[0, 0, 0] == NULL
+    assert specials[1, 2, 1] == HRS
+    assert np.count_nonzero(specials) == 2
+
+
+def test_isis_cube_fast_label(fname):
+    isis = ISISCube(fname)
+    header = isis.pvl['IsisCube']
+
+    assert isis.NS == NS
+    assert isis.NL == NL
+    assert isis.NB == NB
+    assert isis._start_byte == start_byte
+    assert isis.start == header['Instrument']['StartTime'].replace(tzinfo=None)
+    np.testing.assert_array_equal(isis.wvlns, header['BandBin']['Center'])
+
+    assert 'Label' not in isis.label
+    assert 'IsisCube' in isis.label
+
+
+def test_isis_label_parser():
+    from pyvims.isis.header import parse_label, Units
+
+    label = parse_label('''Object = IsisCube
+  Group = Instrument
+    SequenceTitle    = "VIMS_003TI
+                        MAPMONITR001"  /* Comment */
+    ExposureDuration = (160.0 <IR>, 6720.0 <VIS>)
+    Center           = (0.35, 0.36,
+                        0.37) <um>
+    Null             = 16#FF7FFFFB#
+  End_Group
+End_Object
+
+Object = NaifKeywords
+  BODY_FRAME_CODE = 10044
+End_Object
+
+Object = Table
+  Name = A
+  Group = Field
+    Name = Fa
+  End_Group
+  Group = Field
+    Name = Fb
+  End_Group
+End_Object
+
+Object = Table
+  Name = B
+End_Object
+End
+''')
+
+    inst = label['IsisCube']['Instrument']
+    assert inst['SequenceTitle'] == 'VIMS_003TI MAPMONITR001'
+    assert inst['ExposureDuration'] == [Units(160., 'IR'), Units(6720., 'VIS')]
+    assert inst['Center'] == Units([.35, .36, .37], 'um')
+    assert inst['Null'] == 0xFF7FFFFB
+
+    assert 'NaifKeywords' not in label
+    assert [v['Name'] for k, v in label if k == 'Table'] == ['A', 'B']
+    assert [v['Name'] for k, v in label['Table'] if k == 'Field'] == ['Fa', 'Fb']
+
+
+def test_isis_label_quoted_comments():
+    from pyvims.isis.header import parse_label
+
+    label = parse_label('''Object = IsisCube
+  Group = Archive
+    SequenceTitle = "Path /* not a comment */ (open" /* Comment */
+    Description   = "Title with a quote ( and
+                     a paren"
+    Keywords      = ("a /* b", /* Comment ) */
+                     "c")
+  End_Group
+End_Object
+End
+''')
+
+    archive = label['IsisCube']['Archive']
+    assert archive['SequenceTitle'] == 'Path /* not a comment */ (open'
+    assert archive['Description'] == 'Title with a quote ( and a paren'
+    assert archive['Keywords'] == ['a /* b', 'c']
+
+
+def test_isis_read_label_bounded(tmp_path):
+    from pyvims.isis.header import read_label
+    from pyvims.isis.errors import ISISError
+
+    label = '''Object = IsisCube
+  Object = Core
+    StartByte = 129
+  End_Object
+End_Object
+End
+'''
+    fname = tmp_path / 'label.cub'
+    fname.write_bytes(label.encode() + b'\x00' * 64)
+    assert read_label(str(fname), chunk=16) == label.rstrip()
+
+    # Missing `End` statement: the read stops at the `StartByte`
+    fname.write_bytes(label[:-4].encode() + b'\x00' * 200 + b'End\n')
+    with pytest.raises(ISISError, match='first 128 bytes'):
+        read_label(str(fname), chunk=16)
+
+    # Maximum label size
+    fname.write_bytes(b'Object = IsisCube\n' * 100)
+    with pytest.raises(ISISError, match='first 512 bytes'):
+        read_label(str(fname), maxsize=512)
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_vims_matmul_vectorized(fname, data, mmap):
+    from pyvims.isis.vims import VIMS
+    from pyvims.isis.errors import VIMSError
+
+    cube = VIMS(os.path.basename(fname), root=os.path.dirname(fname), mmap=mmap)
+    expected = 2. * data + 1.
+
+    np.testing.assert_array_equal(cube @ [1, 3], expected[[0, 2]])
+    np.testing.assert_array_equal(cube @ np.array([2]), expected[[1]])
+    np.testing.assert_array_equal(cube @ [1.1, 2.9], expected[[0, 4]])
+    np.testing.assert_array_equal(cube @ [(1, 1), (4, 3), (2, 2)],
+                                  expected[:, [0, 3, 1], [0, 2, 1]])
+
+    mask = np.zeros((NL, NS), dtype=bool)
+    mask[1, 2] = mask[3, 0] = True
+    np.testing.assert_array_equal(cube @ mask, expected[:, mask])
+
+    bands = np.zeros(NB, dtype=bool)
+    bands[[1, 4]] = True
+    np.testing.assert_array_equal(cube @ bands, expected[bands])
+
+    with pytest.raises(VIMSError):
+        cube @ [0, 1]
+
+    with pytest.raises(VIMSError):
+        cube @ [(1, 1), (NL + 1, 1)]
+
+    with pytest.raises(VIMSError):
+        cube @ np.ones((2, 2), dtype=bool)
+
+
+def test_vims_stream(tmp_path, data):
+    from pyvims.isis.stream import iter_bands, iter_spectra
+    from pyvims.isis.errors import VIMSError
+
+    fnames = [
+        isis_cube(tmp_path / 'C1487096932_1_ir.cub', data),
+        isis_cube(tmp_path / 'C1487096933_1_ir.cub', data + 100, tiles=(3, 2)),
+    ]
+    fnames = [os.path.basename(fname) for fname in fnames]
+
+    bands = list(iter_bands(fnames, wvln=2.1, root=str(tmp_path)))
+
+    assert [b.img_id for b in bands] == ['C1487096932_1', 'C1487096933_1']
+    assert bands[0].wvln == 2.
+    np.testing.assert_array_equal(bands[0].img, data[2])
+    np.testing.assert_array_equal(bands[1].img, data[2] + 100)
+
+    bands = list(iter_bands(fnames, band=5, root=str(tmp_path)))
+    np.testing.assert_array_equal(bands[1].img, data[4] + 100)
+
+    # Cubes out of range skipped
+    small = isis_cube(tmp_path / 'C1487096934_1_ir.cub', data[:2])
+    fnames.insert(1, os.path.basename(small))
+
+    with pytest.warns(UserWarning, match='C1487096934_1'):
+        bands = list(iter_bands(fnames, band=4, root=str(tmp_path)))
+
+    assert [b.img_id for b in bands] == ['C1487096932_1', 'C1487096933_1']
+
+    with pytest.warns(UserWarning):
+        assert list(iter_bands(fnames, wvln=10, root=str(tmp_path))) == []
+
+    with pytest.raises(VIMSError):
+        next(iter_bands(fnames, root=str(tmp_path)))
+
+    fnames.pop(1)
+
+    def where(cube):
+        img = cube @ 1
+        return (img > 105) & (img < 110)
+
+    spectra = list(iter_spectra(fnames, where=where, root=str(tmp_path)))
+
+    assert len(spectra) == 1
+    assert spectra[0].img_id == 'C1487096933_1'
+    np.testing.assert_array_equal(spectra[0].lines, [3, 3, 3, 4])
+    np.testing.assert_array_equal(spectra[0].samples, [1, 2, 3, 1])
+    np.testing.assert_array_equal(spectra[0].spectra,
+                                  (data + 100)[:, [2, 2, 2, 3], [0, 1, 2, 0]].T)
+
+    spectra = list(iter_spectra(fnames[:1], root=str(tmp_path)))
+    assert spectra[0].spectra.shape == (NL * NS, NB)
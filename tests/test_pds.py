@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+import pytest
+import numpy as np
+
+from pyvims.pds import (PDSQube, item_dtype, parse_keys, read_label,
+                        split_values, start_byte)
+
+
+NB, NL, NS = 5, 4, 3
+
+
+def qube_label(axes, suffix=(0, 0, 0)):
+    items = {'BAND': NB, 'LINE': NL, 'SAMPLE': NS}
+    return {
+        'AXIS_NAME': list(axes),
+        'CORE_ITEMS': [items[axis] for axis in axes],
+        'CORE_ITEM_BYTES': 2,
+        'CORE_ITEM_TYPE': 'SUN_INTEGER',
+        'SUFFIX_ITEMS': list(suffix),
+        'BAND_SUFFIX_NAME': ['TEMP_1', 'TEMP_2', 'TEMP_3', 'TEMP_4'],
+        'SAMPLE_SUFFIX_NAME': 'BACKGROUND',
+    }
+
+
+# Suffix items stored in 4 bytes slots (low order bytes)
+def slots(values, dtype):
+    items = np.asarray(values, dtype=dtype).reshape(-1, 1)
+    msb, items = items.dtype.str[0] == '>', items.view('u1')
+    slot = np.zeros((len(items), 4), dtype='u1')
+    if msb:
+        slot[:, 4 - items.shape[1]:] = items
+    else:
+        slot[:, :items.shape[1]] = items
+    return slot.tobytes()
+
+
+# The N-th suffix item is set to `100 + N` on the first axis,
+# `200 + N` on the second axis and `300 + N` on the third axis
+# with the `dtypes` of each axis (or a list of dtypes per item).
+def qube_file(fname, data, axes, suffix=(0, 0, 0), offset=512,
+              dtypes=('>i4', '>i4', '>i4')):
+    # Qube order (slowest first)
+    core = data.transpose([('BAND', 'LINE', 'SAMPLE').index(axis)
+                           for axis in axes[::-1]])
+
+    n2, n1, n0 = core.shape
+    s0, s1, s2 = suffix
+    d0, d1, d2 = [dtype if isinstance(dtype, list) else [dtype] * n
+                  for dtype, n in zip(dtypes, suffix)]
+
+    sideplane = b''.join(slots(100 + i, dtype) for i, dtype in enumerate(d0))
+    corner = b'\0' * 4 * s0
+
+    with open(fname, 'wb') as f:
+        f.write(b'\0' * offset)
+        for plane in core:
+            for line in plane:
+                f.write(line.astype('>i2').tobytes() + sideplane)
+            for i in range(s1):
+                f.write(slots([200 + i] * n0, d1[i]) + corner)
+        for i in range(s2):
+            for _ in range(n1 + s1):
+                f.write(slots([300 + i] * n0, d2[i]) + corner)
+
+    return str(fname)
+
+
+def test_item_dtype():
+    assert item_dtype('SUN_INTEGER', 2) == np.dtype('>i2')
+    assert item_dtype('PC_REAL', 4) == np.dtype('<f4')
+    assert item_dtype('IEEE_REAL', 4) == np.dtype('>f4')
+    assert item_dtype('MSB_UNSIGNED_INTEGER', 1) == np.dtype('u1')
+
+
+def test_start_byte():
+    assert start_byte({'^QUBE': 3, 'RECORD_BYTES': 512}) == 1024
+    assert start_byte({'^QUBE': ['v123.qub', 3], 'RECORD_BYTES': 512}) == 1024
+
+
+@pytest.mark.parametrize('axes, suffix', [
+    (('SAMPLE', 'BAND', 'LINE'), (1, 4, 0)),
+    (('SAMPLE', 'LINE', 'BAND'), (0, 0, 2)),
+    (('BAND', 'SAMPLE', 'LINE'), (1, 0, 0)),
+])
+def test_pds_qube(tmp_path, data, axes, suffix):
+    fname = qube_file(tmp_path / 'test.qub', data, axes, suffix)
+
+    qube = PDSQube(fname, qube_label(axes, suffix), offset=512)
+
+    assert qube.core.shape == (NB, NL, NS)
+    assert qube.core.dtype == np.dtype('>i2')
+
+    np.testing.assert_array_equal(qube.core, data)
+
+    cube = qube.read(np.float32)
+    assert cube.dtype == np.float32
+    np.testing.assert_array_equal(cube, data)
+
+
+def test_pds_qube_suffix(tmp_path, data):
+    axes, suffix = ('SAMPLE', 'BAND', 'LINE'), (1, 4, 2)
+    fname = qube_file(tmp_path / 'test.qub', data, axes, suffix)
+
+    qube = PDSQube(fname, qube_label(axes, suffix), offset=512)
+
+    np.testing.assert_array_equal(qube.core, data)
+
+    planes = qube.suffix
+
+    assert list(planes) == ['BACKGROUND', 'TEMP_1', 'TEMP_2', 'TEMP_3',
+                            'TEMP_4', 'LINE_SUFFIX_1', 'LINE_SUFFIX_2']
+
+    assert planes['BACKGROUND'].shape == (NB, NL)
+    assert planes['TEMP_1'].shape == (NL, NS)
+    assert planes['LINE_SUFFIX_2'].shape == (NB, NS)
+
+    assert (planes['BACKGROUND'] == 100).all()
+    assert (planes['TEMP_3'] == 202).all()
+    assert (planes['LINE_SUFFIX_2'] == 301).all()
+
+    # Zero-copy views on the same memory map
+    assert np.shares_memory(planes['TEMP_1'], qube.mmap)
+    assert np.shares_memory(planes['LINE_SUFFIX_1'], qube.mmap)
+
+
+@pytest.mark.parametrize('eol', [b'\n', b'\r\n'])
+def test_read_label(tmp_path, eol):
+    label = eol.join([
+        b'PDS_VERSION_ID = PDS3',
+        b'TARGET_NAME    = "TITAN"',
+        b'OBJECT = QUBE',
+        b'  AXIS_NAME = (SAMPLE,LINE,BAND)',
+        b'  CORE_ITEMS = (3,4,15)',
+        b'END_OBJECT = QUBE',
+        b'END',
+        b'',
+    ])
+    fname = tmp_path / 'test.nav'
+    fname.write_bytes(label + b'\xff\xfe' * 100 + b'\nEND\n')
+
+    text, offset = read_label(fname, chunk=16)
+
+    assert offset == len(label)
+    assert text.endswith('END' + eol.decode())
+
+    keys = parse_keys(text)
+
+    assert keys['TARGET_NAME'] == '"TITAN"'
+    assert keys['OBJECT'] == 'QUBE'
+    assert split_values(keys['AXIS_NAME']) == ['SAMPLE', 'LINE', 'BAND']
+    assert split_values(keys['CORE_ITEMS']) == ['3', '4', '15']
+
+    fname.write_bytes(b'TARGET_NAME = TITAN\nEND_OBJECT = QUBE\n')
+
+    with pytest.raises(ValueError):
+        read_label(fname)
+
+    # Maximum label size
+    fname.write_bytes(b'TARGET_NAME = TITAN\n' * 100)
+
+    with pytest.raises(ValueError, match='first 512 bytes'):
+        read_label(fname, maxsize=512)
+
+
+def test_pds_qube_suffix_types(tmp_path, data):
+    axes, suffix = ('SAMPLE', 'BAND', 'LINE'), (1, 4, 2)
+    fname = qube_file(tmp_path / 'test.qub', data, axes, suffix,
+                      dtypes=('>i2', ['>i2', '>i4', '>f4', '<i2'], '<u2'))
+
+    label = qube_label(axes, suffix)
+    label.update({
+        'SUFFIX_BYTES': 4,
+        'SUFFIX_ITEM_TYPE': 'SUN_INTEGER',
+        'SAMPLE_SUFFIX_ITEM_BYTES': 2,
+        'BAND_SUFFIX_ITEM_TYPE': ['SUN_INTEGER', 'SUN_INTEGER', 'IEEE_REAL', 'PC_INTEGER'],
+        'BAND_SUFFIX_ITEM_BYTES': [2, 4, 4, 2],
+        'LINE_SUFFIX_ITEM_TYPE': 'PC_UNSIGNED_INTEGER',
+        'LINE_SUFFIX_ITEM_BYTES': 2,
+    })
+
+    qube = PDSQube(fname, label, offset=512)
+
+    assert qube.suffix_dtypes('SAMPLE') == [np.dtype('>i2')]
+    assert qube.suffix_dtypes('BAND') == [np.dtype('>i2'), np.dtype('>i4'),
+                                          np.dtype('>f4'), np.dtype('<i2')]
+    assert qube.suffix_dtypes('LINE') == [np.dtype('<u2')] * 2
+
+    # Fixed 4 bytes slots
+    assert qube.plane.itemsize == NB * (2 * NS + 4) + 4 * (4 * NS + 4)
+    assert qube.nbytes == NL * qube.plane.itemsize + 2 * (NB + 4) * (4 * NS + 4)
+
+    np.testing.assert_array_equal(qube.core, data)
+
+    planes = qube.suffix
+
+    assert planes['BACKGROUND'].dtype == np.dtype('>i2')
+    assert planes['TEMP_3'].dtype == np.dtype('>f4')
+    assert (planes['BACKGROUND'] == 100).all()
+    assert (planes['TEMP_1'] == 200).all()
+    assert (planes['TEMP_2'] == 201).all()
+    assert (planes['TEMP_3'] == 202).all()
+    assert (planes['TEMP_4'] == 203).all()
+    assert (planes['LINE_SUFFIX_1'] == 300).all()
+    assert (planes['LINE_SUFFIX_2'] == 301).all()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import pytest
+import numpy as np
+
+from pyvims.spectral import SpectralIndex, spectral_index
+
+
+@pytest.fixture
+def wvlns():
+    return np.array([.35, .5, np.nan, .9, 1.2, .88, np.nan, 2.5, 5.1])
+
+
+def test_spectral_index(wvlns):
+    index = SpectralIndex(wvlns)
+
+    assert len(index) == 7
+    assert index.min == .35
+    assert index.max == 5.1
+
+    assert index.indices(.35) == 0
+    assert index.indices(.89) == 3
+    assert index.indices(.885) == 5
+    assert index.indices(10) == 8
+    assert index.indices(0) == 0
+
+    values = np.linspace(0, 6, 101)
+    expected = [np.nanargmin(np.abs(wvlns - value)) for value in values]
+
+    np.testing.assert_array_equal(index.indices(values), expected)
+
+
+def test_spectral_index_ties():
+    index = SpectralIndex([3., 1., 2., 1.])
+
+    assert index.indices(1) == 1
+    assert index.indices(1.5) == 1
+    assert index.indices(2.5) == 0
+
+
+def test_spectral_index_cache(wvlns):
+    assert spectral_index(wvlns) is spectral_index(wvlns.copy())
+    assert spectral_index(wvlns) is not spectral_index(wvlns[:-1])
+
+    with pytest.raises(ValueError):
+        SpectralIndex([np.nan]).indices(1)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import pytest
+import numpy as np
+
+from pyvims.stack import StackedCube, nan_channel
+from pyvims.isis.core import ISISCore
+
+
+NL, NS = 4, 3
+
+
+@pytest.fixture
+def vis():
+    return np.arange(2 * NL * NS, dtype='f4').reshape(2, NL, NS)
+
+
+@pytest.fixture
+def ir():
+    return 100 + np.arange(3 * NL * NS, dtype='>i2').reshape(3, NL, NS)
+
+
+def test_stacked_cube(vis, ir):
+    cube = StackedCube(vis, ISISCore(ir, mult=2., base=1.))
+    expected = np.concatenate([vis, 2. * ir + 1.])
+
+    assert cube.shape == (5, NL, NS)
+    assert len(cube) == 5
+
+    np.testing.assert_array_equal(cube[1], expected[1])
+    np.testing.assert_array_equal(cube[-1], expected[-1])
+    np.testing.assert_array_equal(cube[3, 1:, 2], expected[3, 1:, 2])
+    np.testing.assert_array_equal(cube[:, 2, 1], expected[:, 2, 1])
+    np.testing.assert_array_equal(cube[1:4], expected[1:4])
+    np.testing.assert_array_equal(cube[[4, 0, 2]], expected[[4, 0, 2]])
+    np.testing.assert_array_equal(cube[..., 1], expected[..., 1])
+    np.testing.assert_array_equal(np.asarray(cube), expected)
+
+    assert cube[3:3].shape == (0, NL, NS)
+
+
+def test_stacked_cube_missing_channel(ir):
+    vis = nan_channel((2, NL, NS))
+
+    assert vis.strides == (0, 0, 0)
+
+    cube = StackedCube(vis, ir)
+
+    assert np.isnan(cube[1]).all()
+    np.testing.assert_array_equal(cube[1:3, 0, 0], [np.nan, ir[0, 0, 0]])
+
+    with pytest.raises(ValueError):
+        StackedCube(vis, ir[:, 1:])
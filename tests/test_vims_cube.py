@@ -3,7 +3,10 @@ import pytest
 import os
 from datetime import datetime as dt
 
-from pyvims import VIMS_LBL
+import numpy as np
+
+from pyvims import VIMS, VIMS_LBL, VIMS_TEAM
+from pyvims.vims import getFormat, listdir, MAX_LISTINGS, _LISTINGS
 
 
 cube_root = 'tests/data/'
@@ -68,3 +71,101 @@ def test_VIMS_LBL():
 def test_missing_VIMS_LBL():
     with pytest.raises(NameError) as e_info:
         VIMS_LBL(missing_cube_id, root=cube_root)
+
+def test_VIMS_LBL_lazy():
+    cub = VIMS_LBL(cube_id, root=cube_root)
+
+    with pytest.raises(NotImplementedError) as e_info:
+        cub.cube
+
+    with pytest.raises(AttributeError) as e_info:
+        cub.lon  # Missing NAV file
+
+    cub.cube = 'data'
+    cub.lon = 'lon'
+    assert cub.cube == 'data'
+    assert cub.lon == 'lon'
+
+    cub.unload()
+    assert cub._cube is None
+    assert cub._nav is None
+
+team_label = '''PDS_VERSION_ID = PDS3
+RECORD_BYTES = 512
+^QUBE = 3
+OBJECT = QUBE
+  AXIS_NAME = (SAMPLE, BAND, LINE)
+  CORE_ITEMS = (3, 2, 4)
+  CORE_ITEM_BYTES = 2
+  CORE_ITEM_TYPE = SUN_INTEGER
+  SUFFIX_ITEMS = (1, 0, 0)
+  SAMPLE_SUFFIX_NAME = BACKGROUND
+  INSTRUMENT_HOST_NAME = "CASSINI ORBITER"
+  INSTRUMENT_ID = VIMS
+  TARGET_NAME = TITAN
+  EXPOSURE_DURATION = (160.0, 6720.0)
+  SAMPLING_MODE_ID = (NORMAL, NORMAL)
+  SEQUENCE_ID = S08
+  SEQUENCE_TITLE = VIMS_003TI_MAPMONITR001_CIRS
+  START_TIME = "2005-045T18:02:29.023Z"
+  STOP_TIME = "2005-045T18:07:32.930Z"
+  GROUP = BAND_BIN
+    BAND_BIN_CENTER = (0.35, 0.36)
+    BAND_BIN_ORIGINAL_BAND = (1, 2)
+  END_GROUP = BAND_BIN
+END_OBJECT = QUBE
+END
+'''
+
+def test_VIMS_TEAM_lazy(nav_root, geo):
+    root = nav_root
+    data = np.arange(2 * 4 * 3).reshape(2, 4, 3)
+
+    with open(root + 'CM_' + cube_id + '.cub', 'wb') as f:
+        f.write(team_label.encode().ljust(1024, b' '))
+        for line in data.transpose(1, 0, 2):
+            for band in line:
+                f.write(band.astype('>i2').tobytes() + np.array(7, dtype='>i4').tobytes())
+
+    cub = VIMS_TEAM(cube_id, root=root)
+    assert cub._cube is None
+    assert not cub._navLoaded
+
+    # Navigation planes set before loading are kept
+    cub.lon = 'lon'
+    np.testing.assert_array_equal(cub.lat, geo[1])
+    np.testing.assert_array_equal(cub.inc, geo[2])
+    assert cub.lon == 'lon'
+
+    np.testing.assert_array_equal(cub.cube, data)
+    assert (cub.suffix['BACKGROUND'] == 7).all()
+
+    cub.unload()
+    assert cub._cube is None
+    assert cub._nav is None
+    assert cub.suffix is None
+
+    # Reloaded on next access
+    np.testing.assert_array_equal(cub.lon, geo[0])
+    np.testing.assert_array_equal(cub.cube, data)
+    assert cub.suffix['BACKGROUND'].shape == (2, 4)
+
+def test_VIMS_dispatch():
+    cub = VIMS(cube_id, root=cube_root)
+    assert type(cub) == VIMS_LBL
+
+    assert getFormat('v' + cube_id, root=cube_root) == (VIMS_LBL, cube_root)
+    assert lbl_name in listdir(cube_root)
+
+    with pytest.raises(NameError) as e_info:
+        VIMS(missing_cube_id, root=cube_root)
+
+def test_listdir_lru(tmp_path):
+    for i in range(MAX_LISTINGS + 2):
+        folder = tmp_path / str(i)
+        folder.mkdir()
+        assert listdir('%s/' % folder) == frozenset()
+
+    assert len(_LISTINGS) == MAX_LISTINGS
+    assert str(tmp_path / '0') not in _LISTINGS
+    assert list(_LISTINGS)[-1] == str(tmp_path / str(MAX_LISTINGS + 1))
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import pytest
+import numpy as np
+
+from pyvims import VIMS_NAV, VIMS_NAV_ISIS3
+
+
+NB, NL, NS = 15, 4, 3
+img_id = '1487096932_1'
+
+isis_nav_label = '''Object = IsisCube
+  Object = Core
+    StartByte   = 1025
+    Format      = BandSequential
+    Group = Dimensions
+      Samples = {ns}
+      Lines   = {nl}
+      Bands   = 6
+    End_Group
+    Group = Pixels
+      Type       = Real
+      ByteOrder  = Lsb
+      Base       = 0.0
+      Multiplier = 1.0
+    End_Group
+  End_Object
+  Group = Instrument
+    SpacecraftName = Cassini-Huygens
+    InstrumentId   = VIMS
+    TargetName     = TITAN
+    StartTime      = 2005-045T18:02:29.023
+    StopTime       = 2005-045T18:07:32.930
+  End_Group
+  Group = Archive
+    SequenceId    = S08
+    SequenceTitle = VIMS_003TI_MAPMONITR001_CIRS
+  End_Group
+  Group = BandBin
+    Name = (Latitude, Longitude, "Pixel Resolution", "Incidence Angle",
+            "Emission Angle", "Phase Angle")
+  End_Group
+End_Object
+End
+'''
+
+
+@pytest.fixture
+def geo():
+    data = np.arange(NB * NL * NS, dtype='f4').reshape(NB, NL, NS)
+    data[0, 1, 2] = -99999.
+    return data
+
+
+def test_vims_nav(nav_root, geo):
+    nav = VIMS_NAV(img_id, root=nav_root)
+
+    assert nav.target == 'TITAN'
+    assert nav.geo.shape == (6, NL, NS)
+
+    assert nav.nan[1, 2]
+    assert nav.nan.sum() == 1
+    assert np.isnan(nav.res[1, 2])
+
+    np.testing.assert_array_equal(nav.lat, geo[1] * np.where(nav.nan, np.nan, 1))
+    np.testing.assert_array_equal(nav.res[0], geo[14, 0])
+
+    assert np.shares_memory(nav.lon, nav.geo)
+    assert not hasattr(nav, 'alt')
+
+    nav.readNAV(corners=True)
+
+    assert nav.geo.shape == (NB, NL, NS)
+    assert nav.corners.shape == (8, NL, NS)
+    np.testing.assert_array_equal(nav.alt[0], geo[13, 0])
+
+
+def test_vims_nav_isis3(tmp_path, geo):
+    data = geo[:6].copy()
+    data[1, 1, 2] = -3.4028226550889045e+38  # ISIS NULL
+
+    with open(tmp_path / f'N{img_id}_ir.cub', 'wb') as f:
+        f.write(isis_nav_label.format(ns=NS, nl=NL).encode().ljust(1024, b' '))
+        f.write(data.astype('<f4').tobytes())
+
+    nav = VIMS_NAV_ISIS3(img_id, root=f'{tmp_path}/')
+
+    assert nav.nan[1, 2]
+    assert nav.nan.sum() == 1
+
+    np.testing.assert_array_equal(nav.lat[0], data[0, 0])
+    np.testing.assert_array_equal(nav.res[0], data[2, 0] * 1e-3)
+    assert np.isnan(nav.phase[1, 2])
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import struct
+
+import numpy as np
+
+from pyvir import VIR_QUB
+
+
+NB, NS, NL = 4, 3, 5
+
+lbl = '''PDS_VERSION_ID = PDS3
+RECORD_TYPE = FIXED_LENGTH
+RECORD_BYTES = 512
+^QUBE = 3
+INSTRUMENT_HOST_NAME = "DAWN"
+INSTRUMENT_ID = "VIR"
+TARGET_NAME = "VESTA"
+FRAME_PARAMETER = (1.0 <SECOND>, 0.0, 0.0, 0.0)
+START_TIME = 2011-08-13T07:12:20.420
+STOP_TIME = 2011-08-13T07:22:20.420
+OBJECT = QUBE
+  AXES = 3
+  AXIS_NAME = (BAND, SAMPLE, LINE)
+  CORE_ITEMS = ({nb}, {ns}, {nl})
+  CORE_ITEM_BYTES = 4
+  CORE_ITEM_TYPE = IEEE_REAL
+  SUFFIX_ITEMS = (1, 0, 0)
+  SUFFIX_BYTES = 4
+  BAND_SUFFIX_NAME = BACKGROUND
+  GROUP = BAND_BIN
+    BAND_BIN_CENTER = (1.0, 1.1, 1.2, 1.3)
+    BAND_BIN_ORIGINAL_BAND = (1, 2, 3, 4)
+  END_GROUP = BAND_BIN
+END_OBJECT = QUBE
+END
+'''.format(nb=NB, ns=NS, nl=NL)
+
+
+def old_reader(fname, offset):
+    '''Reference struct reader (`(NB, NS, NL)` Fortran order)'''
+    line = '{}f{}L'.format(NB, 1)
+    with open(fname, 'rb') as f:
+        f.seek(offset)
+        buff = f.read()
+    out = struct.unpack_from('>' + NS * NL * line, buff)
+    return np.array(out, dtype=np.float32).reshape((NB + 1, NS, NL), order='F')[:NB]
+
+
+def test_vir_qub(tmp_path):
+    '''Test VIR qube reader'''
+    img_id = str(tmp_path / 'VIR_IR_1B_1_366390570_1')
+    data = np.arange(NB * NL * NS, dtype='>f4').reshape(NL, NS, NB)
+
+    header = lbl.encode().ljust(1024, b' ')
+    with open(img_id + '.LBL', 'wb') as f:
+        f.write(header)
+    with open(img_id + '.QUB', 'wb') as f:
+        f.write(header)
+        for pixel in data.reshape(NL * NS, NB):
+            f.write(pixel.tobytes() + np.uint32(99).byteswap().tobytes())
+
+    cube = VIR_QUB(img_id)
+
+    assert cube.NB == NB and cube.NL == NL and cube.NS == NS
+    assert cube.cube.dtype == np.float32
+    assert cube.cube.shape == (NB, NL, NS)
+
+    # (NB, NS, NL) legacy orientation transposed into (NB, NL, NS)
+    old = old_reader(cube.fname, 1024)
+    np.testing.assert_array_equal(cube.cube, old.transpose(0, 2, 1))
+    np.testing.assert_array_equal(cube.cube, data.transpose(2, 0, 1))
+
+    assert (cube.suffix['BACKGROUND'] == 99).all()
+    assert cube.suffix['BACKGROUND'].shape == (NL, NS)